@@ -97,7 +97,7 @@ def send_text_tcp_ts(text, host='127.0.0.1', port=TCP_PORT, wpm=25, enable_audio
                 packet_count += 1
                 
                 if debug:
-                    timestamp_ms = int((time.time() - protocol.transmission_start) * 1000) if protocol.transmission_start else 0
+                    timestamp_ms = protocol.elapsed_ms()
                     print(f"[SEND] DOWN (previous spacing: {previous_spacing_ms}ms, ts={timestamp_ms}ms)")
                 else:
                     print(f"[TX {packet_count}]", end='', flush=True)
@@ -120,7 +120,7 @@ def send_text_tcp_ts(text, host='127.0.0.1', port=TCP_PORT, wpm=25, enable_audio
                 packet_count += 1
                 
                 if debug:
-                    timestamp_ms = int((time.time() - protocol.transmission_start) * 1000)
+                    timestamp_ms = protocol.elapsed_ms()
                     print(f"[SEND] UP (element: {element_duration}ms, ts={timestamp_ms}ms)")
                 
                 # Turn off sidetone
@@ -26,11 +26,12 @@ Requirements:
     pip3 install RPi.GPIO
 """
 
+import bisect
+import collections
 import socket
 import sys
 import time
 import threading
-import queue
 import argparse
 from cw_protocol import CWProtocol, UDP_PORT
 from cw_receiver import GPIOKeyer
@@ -39,6 +40,13 @@ from cw_receiver import GPIOKeyer
 class JitterBuffer:
     """Buffer CW events to smooth out network jitter"""
     
+    # Queue depth limit; beyond it the earliest pending event is dropped
+    MAX_QUEUE_EVENTS = 1024
+    
+    # The last stretch before a playout deadline is busy-waited rather than
+    # slept, since condition/sleep wakeups can overshoot by a millisecond or more
+    SPIN_TIME = 0.001
+    
     def __init__(self, buffer_ms=100):
         """
         Initialize jitter buffer with RELATIVE timing
@@ -47,16 +55,20 @@ class JitterBuffer:
             buffer_ms: Buffer depth in milliseconds (recommended: 50-200ms)
         """
         self.buffer_ms = buffer_ms
-        self.event_queue = queue.PriorityQueue()
+        # Pending (playout_time, key_down, duration_ms) in playout order; events
+        # nearly always arrive in time order, so inserts are usually appends
+        self._events = collections.deque()
+        self._cv = threading.Condition()  # Wakes the playout thread early
         self.running = False
         self.callback = None
         self.last_event_end_time = None  # When previous event finishes
         self.last_arrival = None
         
         # Statistics tracking
-        self.stats_delays = []
+        self.stats_delays = collections.deque(maxlen=1000)  # Last 1000 delays
         self.stats_shifts = 0
         self.stats_max_queue = 0
+        self.stats_overflows = 0
         
         # State validation
         self.expected_key_state = None
@@ -66,7 +78,15 @@ class JitterBuffer:
         self.debug = False # Unused?
         
     def add_event(self, key_down, duration_ms, arrival_time):
-        """Add event to buffer using RELATIVE timing to preserve tempo"""
+        """
+        Add event to buffer using RELATIVE timing to preserve tempo
+        
+        Args:
+            key_down: Key state
+            duration_ms: Duration in milliseconds
+            arrival_time: Packet arrival time from time.perf_counter(), the
+                          clock playout is scheduled on
+        """
         
         # Validate state transition
         if self.expected_key_state is not None and key_down == self.expected_key_state:
@@ -77,14 +97,12 @@ class JitterBuffer:
         # Reset if there's a long gap (>2 seconds)
         if self.last_arrival and (arrival_time - self.last_arrival) > 2.0:
             self.last_event_end_time = None
-            while not self.event_queue.empty():
-                try:
-                    self.event_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # Drop stale events
+            with self._cv:
+                self._events.clear()
         
         # Calculate playout time using RELATIVE timing
-        now = time.time()
+        now = time.perf_counter()
         
         if self.last_event_end_time is None:
             # First event: schedule buffer_ms from now
@@ -104,21 +122,33 @@ class JitterBuffer:
         # Calculate when event ends
         event_end_time = playout_time + duration_ms / 1000.0
         
-        # Queue event
-        self.event_queue.put((playout_time, key_down, duration_ms))
+        # Queue event in playout order
+        event = (playout_time, key_down, duration_ms)
+        with self._cv:
+            events = self._events
+            if not events or events[-1] <= event:
+                events.append(event)
+            else:
+                bisect.insort(events, event)
+            qsize = len(events)
+            if qsize > self.MAX_QUEUE_EVENTS:
+                # Bound memory if output falls behind: drop the oldest
+                events.popleft()
+                qsize -= 1
+                self.stats_overflows += 1
+                if self.stats_overflows == 1:
+                    print(f"\n[WARNING] Jitter buffer full ({self.MAX_QUEUE_EVENTS} events) - dropping oldest")
+            self._cv.notify()
         
         # Track delay
         delay = (playout_time - arrival_time) * 1000
         self.stats_delays.append(delay)
-        if len(self.stats_delays) > 1000:
-            self.stats_delays.pop(0)
         
         # Update state
         self.last_event_end_time = event_end_time
         self.last_arrival = arrival_time
         
         # Track max queue depth
-        qsize = self.event_queue.qsize()
         if qsize > self.stats_max_queue:
             self.stats_max_queue = qsize
     
@@ -134,29 +164,44 @@ class JitterBuffer:
     
     def stop(self):
         """Stop buffer processing"""
-        self.running = False
+        with self._cv:
+            self.running = False
+            self._cv.notify()
         if hasattr(self, 'thread'):
             self.thread.join()
     
     def _process_loop(self):
         """Process buffered events and trigger output at correct time"""
         while self.running:
-            try:
-                # Get next event (blocking with timeout)
-                playout_time, key_down, duration_ms = self.event_queue.get(timeout=0.1)
+            spin_until = None
+            with self._cv:
+                if not self._events:
+                    # Idle until add_event() or stop()
+                    self._cv.wait()
+                    continue
                 
-                # Wait until playout time
-                now = time.time()
-                wait_time = playout_time - now
+                # Wait until playout time; an earlier event added meanwhile
+                # wakes us and is picked up first
+                playout_time = self._events[0][0]
+                wait_time = playout_time - time.perf_counter()
+                if wait_time > self.SPIN_TIME:
+                    self._cv.wait(wait_time - self.SPIN_TIME)
+                    continue
                 if wait_time > 0:
-                    time.sleep(wait_time)
-                
-                # Trigger output via callback
-                if self.callback:
-                    self.callback(key_down, duration_ms)
-                
-            except queue.Empty:
+                    spin_until = playout_time  # Spun below, outside the lock
+                else:
+                    playout_time, key_down, duration_ms = self._events.popleft()
+            
+            if spin_until is not None:
+                # Final stretch: spin for sub-millisecond edge accuracy,
+                # yielding the GIL to the receive loop on every pass
+                while self.running and time.perf_counter() < spin_until:
+                    time.sleep(0)
                 continue
+            
+            # Trigger output via callback
+            if self.callback:
+                self.callback(key_down, duration_ms)
     
     def get_stats(self):
         """Return buffer statistics"""
@@ -170,6 +215,7 @@ class JitterBuffer:
             'delay_max': max(self.stats_delays),
             'shifts': self.stats_shifts,
             'max_queue': self.stats_max_queue,
+            'overflows': self.stats_overflows,
             'state_errors': self.state_errors
         }
 
@@ -239,12 +285,12 @@ def main():
     try:
         while True:
             data, addr = sock.recvfrom(1024)
-            arrival_time = time.time()
+            arrival_time = time.perf_counter()
             
             # Parse packet
             result = protocol.parse_packet(data)
-            if result and result['events']:
-                for key_down, duration_ms in result['events']:
+            if result and result.events:
+                for key_down, duration_ms in result.events:
                     jitter_buffer.add_event(key_down, duration_ms, arrival_time)
             
             # Print stats periodically
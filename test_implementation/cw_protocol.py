@@ -3,6 +3,7 @@
 Duration-Encoded CW (DECW) Protocol for UDP/TCP keying events
 """
 
+import collections
 import struct
 import time
 
@@ -10,6 +11,13 @@ import time
 PROTOCOL_VERSION = 0x40  # 01 in bits 7-6
 UDP_PORT = 7355
 
+# Precompiled packet layouts (header + single event, header only)
+_EVENT_PACKET = struct.Struct('BBBB')
+_HEADER = struct.Struct('BBB')
+
+# Decoded packet (events is a list of (key_down, duration_ms) tuples)
+ParsedPacket = collections.namedtuple('ParsedPacket', 'version sequence client_id events eot')
+
 class CWProtocol:
     """Duration-Encoded CW (DECW) Protocol encoder/decoder
     
@@ -115,7 +123,7 @@ class CWProtocol:
             event_byte |= 0x80  # Set bit 7 for key-down
         
         # Pack into bytes
-        packet = struct.pack('BBB B', flags, seq, client_id, event_byte)
+        packet = _EVENT_PACKET.pack(flags, seq, client_id, event_byte)
         
         return packet
     
@@ -135,10 +143,22 @@ class CWProtocol:
         client_id = self.client_id
         
         # Pack header only (no payload for EOT)
-        packet = struct.pack('BBB', flags, seq, client_id)
+        packet = _HEADER.pack(flags, seq, client_id)
         
         return packet
     
+    @staticmethod
+    def peek_sequence(packet_bytes):
+        """
+        Read the sequence number of a raw packet without parsing it
+        
+        Args:
+            packet_bytes: Raw packet data (at least 2 bytes)
+            
+        Returns: sequence number (0-255)
+        """
+        return packet_bytes[1]  # Header: flags, sequence, client_id
+    
     def parse_packet(self, packet_bytes):
         """
         Parse received CW packet
@@ -146,14 +166,14 @@ class CWProtocol:
         Args:
             packet_bytes: Raw packet data
             
-        Returns: dict with keys: version, sequence, client_id, events
+        Returns: ParsedPacket(version, sequence, client_id, events, eot)
                  events is list of (key_down, duration_ms) tuples
         """
         if len(packet_bytes) < 4:
             return None
         
         # Parse header
-        flags, seq, client_id = struct.unpack('BBB', packet_bytes[0:3])
+        flags, seq, client_id = _HEADER.unpack_from(packet_bytes, 0)
         
         # Extract version (bits 7-6)
         version = (flags >> 6) & 0x03
@@ -170,13 +190,7 @@ class CWProtocol:
             duration_ms = self.decode_timing(timing_encoded)
             events.append((key_down, duration_ms))
         
-        return {
-            'version': version,
-            'sequence': seq,
-            'client_id': client_id,
-            'events': events,
-            'eot': is_eot
-        }
+        return ParsedPacket(version, seq, client_id, events, is_eot)
 
 
 class CWTimingStats:
@@ -197,6 +211,16 @@ class CWTimingStats:
             'duration_ms': duration_ms
         })
     
+    def add_events(self, events, timestamp=None):
+        """Record a batch of (key_down, duration_ms) events received together"""
+        if timestamp is None:
+            timestamp = time.time() - self.start_time
+        
+        self.events.extend(
+            {'timestamp': timestamp, 'key_down': key_down, 'duration_ms': duration_ms}
+            for key_down, duration_ms in events
+        )
+    
     def get_stats(self):
         """Calculate statistics"""
         if not self.events:
@@ -205,21 +229,24 @@ class CWTimingStats:
         dits = []
         dahs = []
         spaces = []
+        dit_total = 0  # Running sum so the classifier stays O(n)
         
         for event in self.events:
             duration = event['duration_ms']
             if event['key_down']:
                 # Classify as dit or dah (threshold at 2x dit length)
                 if len(dits) > 0:
-                    avg_dit = sum(dits) / len(dits)
+                    avg_dit = dit_total / len(dits)
                     if duration > avg_dit * 1.5:
                         dahs.append(duration)
                     else:
                         dits.append(duration)
+                        dit_total += duration
                 else:
                     # First element, assume dit if < 100ms, else dah
                     if duration < 100:
                         dits.append(duration)
+                        dit_total += duration
                     else:
                         dahs.append(duration)
             else:
@@ -294,6 +321,6 @@ if __name__ == '__main__':
     parsed = protocol.parse_packet(batch_packet)
     print(f"Parsed: {parsed}")
     print("Events:")
-    for i, (kd, dur) in enumerate(parsed['events']):
+    for i, (kd, dur) in enumerate(parsed.events):
         state = "DOWN" if kd else "UP  "
         print(f"  {i+1}. {state} {dur:3d}ms")
@@ -6,23 +6,42 @@ TCP wrapper around CWProtocol with stream framing and connection management
 
 import socket
 import struct
-import time
 import threading
 from cw_protocol import CWProtocol, UDP_PORT
 
 # TCP uses same default port as UDP
 TCP_PORT = UDP_PORT
 
+# Receive buffer: room for the largest framed packet (2 + 65535 bytes) plus headroom
+RECV_BUFFER_SIZE = 131072
+RECV_CHUNK_SIZE = 4096
+
+# 2-byte length prefix (network byte order)
+_LENGTH_PREFIX = struct.Struct('!H')
+
+# Scatter-gather send (Linux/BSD/macOS); Windows falls back to sendall
+HAVE_SENDMSG = hasattr(socket.socket, 'sendmsg')
+SENDMSG_MAX_PACKETS = 512  # 2 iovecs per packet, stays under IOV_MAX (1024)
+
 
 class CWProtocolTCP(CWProtocol):
-    """TCP wrapper for CW Protocol with length-prefix framing"""
+    """TCP wrapper for CW Protocol with length-prefix framing
+    
+    Sending is single-writer: one keyer thread owns send_packet() and
+    send_eot_packet(), so the send path takes no lock. The lock only
+    serializes recv_packet() callers sharing the receive buffer.
+    """
     
     def __init__(self):
         super().__init__()
         self.sock = None
-        self.recv_buffer = b''
+        # Preallocated receive buffer; unread bytes live in [recv_start, recv_end)
+        self.recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self.recv_view = memoryview(self.recv_buffer)
+        self.recv_start = 0
+        self.recv_end = 0
         self.connected = False
-        self.lock = threading.Lock()  # Thread-safe socket operations
+        self.lock = threading.Lock()  # Guards the receive buffer
         
     def connect(self, host, port=TCP_PORT, timeout=5.0):
         """
@@ -51,6 +70,9 @@ class CWProtocolTCP(CWProtocol):
                 self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)   # Probe every 10s
                 self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)      # Drop after 3 failed probes
             
+            # Disable Nagle - packets are tiny and latency-critical
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
             self.sock.settimeout(timeout)
             self.sock.connect((host, port))
             self.sock.settimeout(None)  # Blocking mode after connection
@@ -62,6 +84,21 @@ class CWProtocolTCP(CWProtocol):
             self.connected = False
             return False
     
+    def _send_framed(self, packet):
+        """
+        Send one packet with its 2-byte length prefix
+        
+        Uses sendmsg() so prefix and payload go out in one syscall without
+        concatenating them first; finishes any partial write with sendall().
+        """
+        length = _LENGTH_PREFIX.pack(len(packet))
+        if HAVE_SENDMSG:
+            sent = self.sock.sendmsg([length, packet])
+            if sent < len(length) + len(packet):
+                self.sock.sendall((length + packet)[sent:])
+        else:
+            self.sock.sendall(length + packet)
+    
     def send_packet(self, key_down, duration_ms, sequence=None):
         """
         Send CW packet over TCP with length prefix
@@ -82,23 +119,55 @@ class CWProtocolTCP(CWProtocol):
             return False
         
         try:
-            with self.lock:
-                # Create CW packet (uses parent class method)
-                packet = self.create_packet(key_down, duration_ms, sequence)
-                
-                # Add length prefix (2 bytes, network byte order)
-                length = struct.pack('!H', len(packet))
-                framed_packet = length + packet
-                
-                # Send all bytes
-                self.sock.sendall(framed_packet)
-                return True
+            # Create CW packet (uses parent class method)
+            packet = self.create_packet(key_down, duration_ms, sequence)
+            self._send_framed(packet)
+            return True
                 
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             print(f"[TCP] Send failed: {e}")
             self.connected = False
             return False
     
+    def send_many(self, packets):
+        """
+        Send several already-built packets in one scatter-gather write
+        
+        Used at transmission boundaries (e.g. final events plus EOT) so the
+        whole burst costs one syscall instead of one per packet.
+        
+        Args:
+            packets: iterable of packet bytes (from create_packet/create_eot_packet)
+            
+        Returns:
+            True if sent successfully, False on error
+        """
+        if not self.connected or not self.sock:
+            return False
+        
+        try:
+            iov = []
+            for packet in packets:
+                iov.append(_LENGTH_PREFIX.pack(len(packet)))
+                iov.append(packet)
+            
+            if HAVE_SENDMSG:
+                step = SENDMSG_MAX_PACKETS * 2
+                for i in range(0, len(iov), step):
+                    batch = iov[i:i + step]
+                    sent = self.sock.sendmsg(batch)
+                    total = sum(len(buf) for buf in batch)
+                    if sent < total:
+                        self.sock.sendall(b''.join(batch)[sent:])
+            else:
+                self.sock.sendall(b''.join(iov))
+            return True
+            
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            print(f"[TCP] Send failed: {e}")
+            self.connected = False
+            return False
+    
     def send_eot_packet(self):
         """
         Send End-of-Transmission packet
@@ -110,17 +179,10 @@ class CWProtocolTCP(CWProtocol):
             return False
         
         try:
-            with self.lock:
-                # Create EOT packet (uses parent class method)
-                packet = self.create_eot_packet()
-                
-                # Add length prefix
-                length = struct.pack('!H', len(packet))
-                framed_packet = length + packet
-                
-                # Send all bytes
-                self.sock.sendall(framed_packet)
-                return True
+            # Create EOT packet (uses parent class method)
+            packet = self.create_eot_packet()
+            self._send_framed(packet)
+            return True
                 
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             print(f"[TCP] Send EOT failed: {e}")
@@ -135,7 +197,7 @@ class CWProtocolTCP(CWProtocol):
             timeout: Receive timeout in seconds (None = blocking)
             
         Returns:
-            Parsed packet dict, or None on error/timeout
+            ParsedPacket, or None on error/timeout
         """
         if not self.connected or not self.sock:
             return None
@@ -147,30 +209,31 @@ class CWProtocolTCP(CWProtocol):
             
             with self.lock:
                 # Read 2-byte length prefix
-                while len(self.recv_buffer) < 2:
-                    chunk = self.sock.recv(4096)
-                    if not chunk:
+                while self.recv_end - self.recv_start < 2:
+                    if not self._recv_more():
                         # Connection closed
                         self.connected = False
                         return None
-                    self.recv_buffer += chunk
                 
                 # Extract length
-                length = struct.unpack('!H', self.recv_buffer[0:2])[0]
+                length = _LENGTH_PREFIX.unpack_from(self.recv_buffer, self.recv_start)[0]
                 
                 # Read packet data (wait for complete packet)
                 total_needed = 2 + length
-                while len(self.recv_buffer) < total_needed:
-                    chunk = self.sock.recv(4096)
-                    if not chunk:
+                while self.recv_end - self.recv_start < total_needed:
+                    if not self._recv_more():
                         # Connection closed mid-packet
                         self.connected = False
                         return None
-                    self.recv_buffer += chunk
                 
-                # Extract packet
-                packet_data = self.recv_buffer[2:2+length]
-                self.recv_buffer = self.recv_buffer[2+length:]  # Remove from buffer
+                # Extract packet (only copy made on the receive path)
+                start = self.recv_start + 2
+                packet_data = bytes(self.recv_view[start:start + length])
+                self.recv_start += total_needed
+                if self.recv_start == self.recv_end:
+                    # Buffer fully consumed - rewind for free
+                    self.recv_start = 0
+                    self.recv_end = 0
                 
                 # Parse packet (uses parent class method)
                 parsed = self.parse_packet(packet_data)
@@ -190,6 +253,32 @@ class CWProtocolTCP(CWProtocol):
                 except:
                     pass
     
+    def _recv_more(self):
+        """
+        Read more stream data into the receive buffer
+        
+        Unread bytes are moved to the front of the buffer only when the
+        free space at the end runs low, so steady-state receives copy
+        nothing but the kernel-to-user transfer.
+        
+        Returns:
+            Number of bytes received (0 = connection closed)
+        """
+        if len(self.recv_buffer) - self.recv_end < RECV_CHUNK_SIZE:
+            pending = self.recv_end - self.recv_start
+            self.recv_buffer[:pending] = self.recv_buffer[self.recv_start:self.recv_end]
+            self.recv_start = 0
+            self.recv_end = pending
+        
+        received = self.sock.recv_into(self.recv_view[self.recv_end:])
+        self.recv_end += received
+        return received
+    
+    def reset_recv_buffer(self):
+        """Discard any buffered stream data (e.g. when a new client connects)"""
+        self.recv_start = 0
+        self.recv_end = 0
+    
     def is_connected(self):
         """Check if connection is active"""
         return self.connected and self.sock is not None
@@ -207,7 +296,7 @@ class CWProtocolTCP(CWProtocol):
             except:
                 pass
             self.sock = None
-        self.recv_buffer = b''
+        self.reset_recv_buffer()
 
 
 class CWServerTCP:
@@ -267,6 +356,7 @@ class CWServerTCP:
             
             self.client_sock, self.client_addr = self.server_sock.accept()
             self.protocol.sock = self.client_sock
+            self.protocol.reset_recv_buffer()
             self.protocol.connected = True
             
             # Restore blocking mode
@@ -335,7 +425,7 @@ if __name__ == '__main__':
     
     # Test framing
     print("\n2. Testing length-prefix framing:")
-    length_prefix = struct.pack('!H', len(packet))
+    length_prefix = _LENGTH_PREFIX.pack(len(packet))
     framed = length_prefix + packet
     print(f"   Framed packet: {framed.hex()} ({len(framed)} bytes)")
     print(f"   Length prefix: {length_prefix.hex()} = {len(packet)} bytes")
@@ -4,28 +4,67 @@ CW Protocol TCP with Timestamps
 TCP implementation with relative timestamps for realtime sync
 """
 
+import contextlib
+import itertools
 import socket
 import struct
 import time
 import threading
-from cw_protocol import CWProtocol, UDP_PORT
+from cw_protocol import CWProtocol
 
 # TCP Timestamp uses separate port from duration-based TCP
 TCP_TS_PORT = 7356  # TCP timestamp protocol port
 TCP_PORT = TCP_TS_PORT  # Alias for compatibility
 
+# Receive buffer: room for the largest framed packet (2 + 65535 bytes) plus headroom
+RECV_BUFFER_SIZE = 131072
+RECV_CHUNK_SIZE = 4096
+
+# Kernel socket buffers sized to absorb bursts without blocking the sender
+SOCKET_BUFFER_SIZE = 262144
+# Wake recv() only once a full minimal frame can be present (2-byte length + 7-byte packet)
+RECV_LOW_WATER = 8
+
+# Length prefix for TCP framing (network byte order)
+_LENGTH_PREFIX = struct.Struct('!H')
+
+# Packet layouts: [sequence(1)] [state(1)] [duration(1 or 2)] [timestamp(4)]
+_PACKET_1BYTE = struct.Struct('!BBBI')
+_PACKET_2BYTE = struct.Struct('!BBHI')
+
+# Framed layouts used for sends: [length(2)] + packet
+_FRAMED_1BYTE = struct.Struct('!HBBBI')
+_FRAMED_2BYTE = struct.Struct('!HBBHI')
+
 
 class CWProtocolTCPTimestamp(CWProtocol):
-    """TCP CW Protocol with relative timestamps for burst-resistant timing"""
+    """
+    TCP CW Protocol with relative timestamps for burst-resistant timing
+    
+    Sequence numbers come from an itertools.count(), whose next() is atomic
+    under the GIL, so timestamp and sequence math never take a lock;
+    sequence_number mirrors the next number to be sent. The lock
+    only serializes writes into the shared send buffer and socket; a sender
+    driven by a single keyer thread can pass thread_safe=False to skip it.
+    """
     
-    def __init__(self):
+    def __init__(self, thread_safe=True):
         super().__init__()
         self.sock = None
         self.listen_sock = None  # Separate listening socket
-        self.recv_buffer = b''
+        # Preallocated receive buffer; unread bytes live in [recv_start, recv_end)
+        self.recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self.recv_view = memoryview(self.recv_buffer)
+        self.recv_start = 0
+        self.recv_end = 0
+        self.recv_errors = 0  # Socket errors seen while receiving
+        # Reusable send buffer, large enough for one framed 2-byte-duration packet
+        self.send_buffer = bytearray(_FRAMED_2BYTE.size)
+        self.send_view = memoryview(self.send_buffer)
         self.connected = False
-        self.lock = threading.Lock()
-        self.transmission_start = None  # Timestamp of first packet
+        self.lock = threading.Lock() if thread_safe else contextlib.nullcontext()
+        self._seq_iter = itertools.count()
+        self.transmission_start = None  # time.monotonic_ns() of first packet
         
     def connect(self, host, port=TCP_PORT, timeout=5.0):
         """Establish TCP connection to receiver"""
@@ -44,6 +83,8 @@ class CWProtocolTCPTimestamp(CWProtocol):
                 self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)   # Probe every 10s
                 self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)      # Drop after 3 failed probes
             
+            self._tune_socket(self.sock)
+            
             self.sock.settimeout(timeout)
             self.sock.connect((host, port))
             self.sock.settimeout(None)
@@ -61,6 +102,18 @@ class CWProtocolTCPTimestamp(CWProtocol):
                 self.sock = None
             raise  # Re-raise exception for caller to handle
     
+    def elapsed_ms(self):
+        """Milliseconds since the first packet of this transmission (0 if idle)"""
+        if self.transmission_start is None:
+            return 0
+        return (time.monotonic_ns() - self.transmission_start) // 1_000_000
+    
+    def _next_sequence(self):
+        """Claim the next 8-bit sequence number and advance sequence_number"""
+        sequence = next(self._seq_iter) & 0xFF
+        self.sequence_number = (sequence + 1) & 0xFF  # Read by stats and EOT
+        return sequence
+    
     def send_packet(self, key_down, duration_ms, sequence=None):
         """
         Send CW packet with timestamp
@@ -78,41 +131,27 @@ class CWProtocolTCPTimestamp(CWProtocol):
         if not self.connected or not self.sock:
             return False
         
+        # Initialize transmission start time on first packet
+        if self.transmission_start is None:
+            self.transmission_start = time.monotonic_ns()
+        
+        # Calculate relative timestamp (ms since transmission start)
+        relative_time_ms = self.elapsed_ms()
+        
+        if sequence is None:
+            sequence = self._next_sequence()
+        state_byte = 0x01 if key_down else 0x00
+        
+        # 1-byte duration if <256ms, else 2 bytes
+        framed = _FRAMED_1BYTE if duration_ms < 256 else _FRAMED_2BYTE
+        
         try:
             with self.lock:
-                # Initialize transmission start time on first packet
-                if self.transmission_start is None:
-                    self.transmission_start = time.time()
-                
-                # Calculate relative timestamp (ms since transmission start)
-                relative_time_ms = int((time.time() - self.transmission_start) * 1000)
-                
-                # Build packet
-                if sequence is None:
-                    sequence = self.sequence_number
-                    self.sequence_number = (self.sequence_number + 1) % 256
-                
-                state_byte = 0x01 if key_down else 0x00
-                
-                # Encode duration
-                if duration_ms < 256:
-                    duration_bytes = struct.pack('B', duration_ms)
-                else:
-                    duration_bytes = struct.pack('!H', duration_ms)
-                
-                # Add timestamp (4 bytes, supports up to ~49 days)
-                timestamp_bytes = struct.pack('!I', relative_time_ms)
-                
-                # Assemble packet
-                packet = struct.pack('BB', sequence, state_byte) + duration_bytes + timestamp_bytes
-                
-                # Add length prefix
-                length = struct.pack('!H', len(packet))
-                framed_packet = length + packet
-                
-                # Send
-                self.sock.sendall(framed_packet)
-                return True
+                # Frame in place and send
+                framed.pack_into(self.send_buffer, 0, framed.size - 2,
+                                 sequence, state_byte, duration_ms, relative_time_ms)
+                self.sock.sendall(self.send_view[:framed.size])
+            return True
                 
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
             self.connected = False
@@ -124,31 +163,74 @@ class CWProtocolTCPTimestamp(CWProtocol):
                 self.sock = None
             raise  # Re-raise for caller to handle reconnection
     
+    def send_packet_batch(self, events):
+        """
+        Send several CW events with a single sendall()
+        
+        The first event is stamped with the current time and each following
+        event's timestamp advances by its own duration, so the receiver
+        schedules the batch exactly as if it had been sent in real time.
+        
+        Args:
+            events: sequence of (key_down, duration_ms) tuples
+        
+        Returns:
+            True if sent successfully, False if not connected
+        """
+        if not self.connected or not self.sock:
+            return False
+        if not events:
+            return True
+        
+        buf = bytearray(len(events) * _FRAMED_2BYTE.size)
+        offset = 0
+        
+        if self.transmission_start is None:
+            self.transmission_start = time.monotonic_ns()
+        relative_time_ms = self.elapsed_ms()
+        
+        for index, (key_down, duration_ms) in enumerate(events):
+            if index:
+                relative_time_ms += duration_ms
+            state_byte = 0x01 if key_down else 0x00
+            framed = _FRAMED_1BYTE if duration_ms < 256 else _FRAMED_2BYTE
+            framed.pack_into(buf, offset, framed.size - 2,
+                             self._next_sequence(), state_byte, duration_ms, relative_time_ms)
+            offset += framed.size
+        
+        try:
+            with self.lock:
+                self.sock.sendall(memoryview(buf)[:offset])
+            return True
+                
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            self.connected = False
+            if self.sock:
+                try:
+                    self.sock.close()
+                except:
+                    pass
+                self.sock = None
+            raise  # Re-raise for caller to handle reconnection
+    
     def send_eot_packet(self):
         """Send End-of-Transmission packet"""
         if not self.connected or not self.sock:
             return False
         
+        # EOT: special marker with timestamp (duration 0)
+        relative_time_ms = self.elapsed_ms()
+        sequence = self.sequence_number  # Not consumed, as before
+        
         try:
             with self.lock:
-                # EOT: special marker with timestamp
-                packet = struct.pack('BB', self.sequence_number, 0xFF)
-                packet += struct.pack('B', 0)  # Duration 0
-                
-                # Add timestamp
-                if self.transmission_start is None:
-                    relative_time_ms = 0
-                else:
-                    relative_time_ms = int((time.time() - self.transmission_start) * 1000)
-                packet += struct.pack('!I', relative_time_ms)
-                
-                # Frame and send
-                length = struct.pack('!H', len(packet))
-                self.sock.sendall(length + packet)
-                
-                # Reset for next transmission
-                self.transmission_start = None
-                return True
+                _FRAMED_1BYTE.pack_into(self.send_buffer, 0, _FRAMED_1BYTE.size - 2,
+                                        sequence, 0xFF, 0, relative_time_ms)
+                self.sock.sendall(self.send_view[:_FRAMED_1BYTE.size])
+            
+            # Reset for next transmission
+            self.transmission_start = None
+            return True
                 
         except (BrokenPipeError, ConnectionResetError, OSError):
             self.connected = False
@@ -165,58 +247,66 @@ class CWProtocolTCPTimestamp(CWProtocol):
         if not self.connected or not self.sock:
             return None
         
-        try:
-            # Read length prefix (2 bytes)
-            while len(self.recv_buffer) < 2:
-                chunk = self.sock.recv(4096)
-                if not chunk:
-                    self.connected = False
-                    return None
-                self.recv_buffer += chunk
-            
-            # Parse length
-            length = struct.unpack('!H', self.recv_buffer[:2])[0]
-            self.recv_buffer = self.recv_buffer[2:]
-            
-            # Read packet data
-            while len(self.recv_buffer) < length:
-                chunk = self.sock.recv(4096)
-                if not chunk:
-                    self.connected = False
-                    return None
-                self.recv_buffer += chunk
-            
-            # Extract packet
-            packet = self.recv_buffer[:length]
-            self.recv_buffer = self.recv_buffer[length:]
-            
-            # Parse packet
-            if len(packet) < 7:  # Min: seq(1) + state(1) + dur(1) + ts(4)
+        # Fill until a whole frame (2-byte length prefix + packet) is buffered;
+        # socket errors are counted in _recv_more
+        while True:
+            available = self.recv_end - self.recv_start
+            if available >= 2:
+                length = _LENGTH_PREFIX.unpack_from(self.recv_buffer, self.recv_start)[0]
+                if available >= 2 + length:
+                    break
+            if not self._recv_more():
+                self.connected = False
                 return None
-            
-            sequence = packet[0]
-            state = packet[1]
-            
-            # Check for EOT
-            if state == 0xFF:
-                return None
-            
-            # Parse duration
-            if len(packet) == 7:  # 1-byte duration
-                duration_ms = packet[2]
-                timestamp_ms = struct.unpack('!I', packet[3:7])[0]
-            else:  # 2-byte duration
-                duration_ms = struct.unpack('!H', packet[2:4])[0]
-                timestamp_ms = struct.unpack('!I', packet[4:8])[0]
-            
-            key_down = (state == 0x01)
-            
-            return (key_down, duration_ms, timestamp_ms)
-            
-        except Exception as e:
-            print(f"[TCP] Recv error: {e}")
-            self.connected = False
+        
+        # Extract packet (zero-copy view, parsed before the buffer is reused)
+        start = self.recv_start + 2
+        packet = self.recv_view[start:start + length]
+        self.recv_start = start + length
+        if self.recv_start == self.recv_end:
+            # Buffer fully consumed - rewind for free
+            self.recv_start = 0
+            self.recv_end = 0
+        
+        # Parse packet: 1-byte duration is the common case, checked first
+        if length == 7:
+            _, state, duration_ms, timestamp_ms = _PACKET_1BYTE.unpack_from(packet, 0)
+        elif length >= 8:
+            _, state, duration_ms, timestamp_ms = _PACKET_2BYTE.unpack_from(packet, 0)
+        else:  # Min: seq(1) + state(1) + dur(1) + ts(4)
             return None
+        
+        # Check for EOT
+        if state == 0xFF:
+            return None
+        
+        key_down = (state == 0x01)
+        
+        return (key_down, duration_ms, timestamp_ms)
+    
+    def _recv_more(self):
+        """
+        Read more stream data into the receive buffer
+        
+        Unread bytes are moved to the front only when the free space at the
+        end runs low, so the buffer is never reallocated or re-sliced.
+        
+        Returns:
+            Number of bytes received (0 = connection closed or failed)
+        """
+        if len(self.recv_buffer) - self.recv_end < RECV_CHUNK_SIZE:
+            pending = self.recv_end - self.recv_start
+            self.recv_buffer[:pending] = self.recv_buffer[self.recv_start:self.recv_end]
+            self.recv_start = 0
+            self.recv_end = pending
+        
+        try:
+            received = self.sock.recv_into(self.recv_view[self.recv_end:])
+        except OSError:  # Includes ConnectionError and socket.timeout
+            self.recv_errors += 1
+            return 0
+        self.recv_end += received
+        return received
     
     def listen(self, port=TCP_PORT, backlog=1):
         """Start TCP server (receiver side)"""
@@ -237,6 +327,20 @@ class CWProtocolTCPTimestamp(CWProtocol):
             print(f"[TCP] Listen failed: {e}")
             return False
     
+    @staticmethod
+    def _tune_socket(sock):
+        """Apply buffer sizes, low-water mark and TCP_NODELAY to a stream socket"""
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        
+        # Not supported everywhere (e.g. Windows rejects it); purely an optimization
+        if hasattr(socket, 'SO_RCVLOWAT'):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVLOWAT, RECV_LOW_WATER)
+            except OSError:
+                pass
+    
     def accept(self):
         """Accept incoming connection (receiver side)"""
         try:
@@ -252,9 +356,11 @@ class CWProtocolTCPTimestamp(CWProtocol):
             conn, addr = self.listen_sock.accept()
             
             # Store connection socket
+            self._tune_socket(conn)
             self.sock = conn
             self.connected = True
-            self.recv_buffer = b''
+            self.recv_start = 0
+            self.recv_end = 0
             self.transmission_start = None
             
             return addr
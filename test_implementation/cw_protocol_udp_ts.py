@@ -7,11 +7,20 @@ UDP implementation with relative timestamps for realtime sync and burst resistan
 import socket
 import struct
 import time
-from cw_protocol import CWProtocol, UDP_PORT
+from cw_protocol import CWProtocol
 
 # UDP Timestamp uses separate port
 UDP_TS_PORT = 7357  # UDP timestamp protocol port
 
+# Packet layouts: [sequence(1)] [state(1)] [duration(1 or 2)] [timestamp(4)]
+_PACKET_1BYTE = struct.Struct('!BBBI')
+_PACKET_2BYTE = struct.Struct('!BBHI')
+
+# Sequence gaps this large are backward jumps (duplicate, reorder, restart);
+# a step back by at most SEQUENCE_REORDER_WINDOW is a duplicate or late packet
+SEQUENCE_RESET_GAP = 100
+SEQUENCE_REORDER_WINDOW = 8
+
 
 class CWProtocolUDPTimestamp(CWProtocol):
     """UDP CW Protocol with relative timestamps for burst-resistant timing"""
@@ -19,11 +28,17 @@ class CWProtocolUDPTimestamp(CWProtocol):
     def __init__(self):
         super().__init__()
         self.sock = None
-        self.transmission_start = None  # Timestamp of first packet
+        self.transmission_start = None  # time.monotonic_ns() of first packet
         self.last_sequence = None  # Track sequence numbers
         self.packets_received = 0  # Statistics
         self.packets_lost = 0  # Statistics
         
+        # Preallocated receive buffer (datagrams are parsed in place)
+        self._rxbuf = bytearray(2048)
+        # Reusable send buffer sized for the 2-byte-duration layout
+        self._txbuf = bytearray(_PACKET_2BYTE.size)
+        self._txmv = memoryview(self._txbuf)
+        
     def create_socket(self, port=UDP_TS_PORT):
         """Create UDP socket"""
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -31,6 +46,12 @@ class CWProtocolUDPTimestamp(CWProtocol):
         self.sock.bind(('', port))
         return self.sock
     
+    def elapsed_ms(self):
+        """Milliseconds since the first packet of this transmission (0 if idle)"""
+        if self.transmission_start is None:
+            return 0
+        return (time.monotonic_ns() - self.transmission_start) // 1_000_000
+    
     def send_packet(self, key_down, duration_ms, dest_addr):
         """
         Send timestamped UDP packet
@@ -42,36 +63,62 @@ class CWProtocolUDPTimestamp(CWProtocol):
         """
         # Initialize transmission start time on first packet
         if self.transmission_start is None:
-            self.transmission_start = time.time()
-            timestamp_ms = 0
-        else:
-            # Calculate relative timestamp (milliseconds since start)
-            timestamp_ms = int((time.time() - self.transmission_start) * 1000)
+            self.transmission_start = time.monotonic_ns()
         
-        # Encode packet
-        state_byte = 1 if key_down else 0
+        # Relative timestamp (milliseconds since start)
+        timestamp_ms = self.elapsed_ms()
         
-        # Encode duration (1 or 2 bytes)
+        # Encode packet in place: [sequence] [state] [duration 1-2] [timestamp]
+        state_byte = 1 if key_down else 0
         if duration_ms <= 255:
-            duration_bytes = struct.pack('B', duration_ms)
+            layout = _PACKET_1BYTE
         else:
-            duration_bytes = struct.pack('!H', duration_ms)  # Big-endian 16-bit
-        
-        # Encode timestamp (4 bytes, big-endian)
-        timestamp_bytes = struct.pack('!I', timestamp_ms)
-        
-        # Build packet: [sequence] [state] [duration] [timestamp]
-        packet = struct.pack('B', self.sequence_number)
-        packet += struct.pack('B', state_byte)
-        packet += duration_bytes
-        packet += timestamp_bytes
+            layout = _PACKET_2BYTE  # Big-endian 16-bit duration
+        layout.pack_into(self._txbuf, 0, self.sequence_number, state_byte, duration_ms, timestamp_ms)
         
         # Send packet
-        self.sock.sendto(packet, dest_addr)
+        self.sock.sendto(self._txmv[:layout.size], dest_addr)
         
         # Increment sequence number
         self.sequence_number = (self.sequence_number + 1) % 256
     
+    def send_packet_batch(self, events, dest_addr):
+        """
+        Send several timestamped UDP packets in one tight loop
+        
+        Timestamps follow the same rule as the TCP variant: the first event is
+        stamped now and each following one advances by its own duration.
+        
+        Args:
+            events: sequence of (key_down, duration_ms) tuples
+            dest_addr: tuple - (host, port) destination
+        """
+        if not events:
+            return
+        
+        if self.transmission_start is None:
+            self.transmission_start = time.monotonic_ns()
+        timestamp_ms = self.elapsed_ms()
+        
+        # Bind hot-loop lookups once for the whole batch
+        sendto = self.sock.sendto
+        pack_1byte = _PACKET_1BYTE.pack
+        pack_2byte = _PACKET_2BYTE.pack
+        sequence = self.sequence_number
+        
+        for index, (key_down, duration_ms) in enumerate(events):
+            if index:
+                timestamp_ms += duration_ms
+            state_byte = 1 if key_down else 0
+            if duration_ms <= 255:
+                packet = pack_1byte(sequence, state_byte, duration_ms, timestamp_ms)
+            else:
+                packet = pack_2byte(sequence, state_byte, duration_ms, timestamp_ms)
+            sendto(packet, dest_addr)
+            sequence = (sequence + 1) % 256
+        
+        self.sequence_number = sequence
+    
     def recv_packet(self):
         """
         Receive timestamped UDP packet
@@ -81,40 +128,37 @@ class CWProtocolUDPTimestamp(CWProtocol):
             Special: Returns ('EOT', 0, timestamp_ms, sender_addr) for end-of-transmission
         """
         try:
-            data, addr = self.sock.recvfrom(1024)
+            nbytes, addr = self.sock.recvfrom_into(self._rxbuf)
             
-            if len(data) < 7:  # Minimum: seq(1) + state(1) + duration(1) + timestamp(4)
+            # Decode in place; 1-byte duration is the common case, checked first
+            if nbytes == 7:
+                sequence, state_byte, duration_ms, timestamp_ms = _PACKET_1BYTE.unpack_from(self._rxbuf, 0)
+                
+                # End-of-transmission marker: state 0xFF, duration 0
+                if state_byte == 0xFF and duration_ms == 0:
+                    return ('EOT', 0, timestamp_ms, addr)
+            elif nbytes == 8:
+                sequence, state_byte, duration_ms, timestamp_ms = _PACKET_2BYTE.unpack_from(self._rxbuf, 0)
+            else:  # Valid packets are seq(1) + state(1) + duration(1-2) + timestamp(4)
                 return None
             
-            # Check for EOT packet first
-            if self.is_eot_packet(data):
-                timestamp_ms = struct.unpack('!I', data[3:7])[0]
-                return ('EOT', 0, timestamp_ms, addr)
-            
-            # Parse packet
-            sequence = data[0]
-            state_byte = data[1]
             key_down = (state_byte == 1)
             
-            # Parse duration (check packet length)
-            if len(data) == 7:
-                # 1-byte duration
-                duration_ms = data[2]
-                timestamp_ms = struct.unpack('!I', data[3:7])[0]
-            elif len(data) == 8:
-                # 2-byte duration
-                duration_ms = struct.unpack('!H', data[2:4])[0]
-                timestamp_ms = struct.unpack('!I', data[4:8])[0]
-            else:
-                return None
-            
             # Track sequence
             if self.last_sequence is not None:
-                expected = (self.last_sequence + 1) % 256
-                if sequence != expected:
-                    self.packets_lost += abs(sequence - expected)
-            
-            self.last_sequence = sequence
+                # Gap modulo 256 (zero when in order), correct across wrap-around.
+                # Duplicates (255), late packets (254...) and sender restarts
+                # look like huge gaps: like CWReceiver, only gaps below
+                # SEQUENCE_RESET_GAP count as loss
+                gap = (sequence - self.last_sequence - 1) & 0xFF
+                if gap < SEQUENCE_RESET_GAP:
+                    self.packets_lost += gap
+                    self.last_sequence = sequence
+                elif gap < 256 - SEQUENCE_REORDER_WINDOW:
+                    self.last_sequence = sequence  # Restart: track the new sequence
+                # else: duplicate or late packet - keep tracking the newest
+            else:
+                self.last_sequence = sequence
             self.packets_received += 1
             
             return (key_down, duration_ms, timestamp_ms, addr)
@@ -133,16 +177,10 @@ class CWProtocolUDPTimestamp(CWProtocol):
             dest_addr: tuple - (host, port) destination
         """
         # EOT packet: [sequence] [0xFF] [0x00] [timestamp]
-        timestamp_ms = 0
-        if self.transmission_start is not None:
-            timestamp_ms = int((time.time() - self.transmission_start) * 1000)
-        
-        timestamp_bytes = struct.pack('!I', timestamp_ms)
-        
-        eot_packet = struct.pack('BBB', self.sequence_number, 0xFF, 0x00)
-        eot_packet += timestamp_bytes
+        timestamp_ms = self.elapsed_ms()
         
-        self.sock.sendto(eot_packet, dest_addr)
+        _PACKET_1BYTE.pack_into(self._txbuf, 0, self.sequence_number, 0xFF, 0x00, timestamp_ms)
+        self.sock.sendto(self._txmv[:_PACKET_1BYTE.size], dest_addr)
         self.sequence_number = (self.sequence_number + 1) % 256
         
         # Reset transmission start for next transmission
@@ -3,13 +3,26 @@
 CW Receiver - Listen for CW keying events and generate sidetone
 """
 
+import collections
+import heapq
+import itertools
+import os
+import platform
+import selectors
 import socket
+import struct
 import sys
 import time
 import threading
-import queue
 from cw_protocol import CWProtocol, CWTimingStats, UDP_PORT
 
+# NumPy (optional; jitter statistics fall back to pure Python without it)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # Audio support (optional)
 try:
     import pyaudio
@@ -20,6 +33,78 @@ except ImportError:
     print("Warning: pyaudio not available, audio sidetone disabled")
     print("Install with: pip3 install pyaudio")
 
+# Sidetone oscillator: one sine period in a power-of-two wavetable,
+# indexed by the top bits of a 32-bit phase accumulator
+SINE_TABLE_BITS = 12
+SINE_TABLE_SIZE = 1 << SINE_TABLE_BITS  # 4096 entries (16 KB float32)
+PHASE_BITS = 32
+PHASE_MASK = (1 << PHASE_BITS) - 1
+
+# The vectorized renderer works in blocks of at most this many frames: its
+# closed-form filter scales by (1 - alpha)^-n, which overflows float64 for
+# blocks of a few thousand frames
+RENDER_BLOCK_FRAMES = 256
+
+# Optional JIT for the per-sample sidetone kernel (NumPy renderer otherwise)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _render_chunk_jit(out, phase, envelope, filter_state, rate,
+                          phase_increment, volume, sine_table, filter_alpha):
+        """Per-sample envelope/oscillator/filter loop; returns updated state"""
+        shift = PHASE_BITS - SINE_TABLE_BITS
+        for i in range(out.shape[0]):
+            envelope = min(max(envelope + rate, 0.0), 1.0)
+            if envelope > 0.0001:
+                raw = sine_table[phase >> shift] * envelope * volume
+                filter_state += filter_alpha * (raw - filter_state)
+                out[i] = filter_state
+                phase = (phase + phase_increment) & PHASE_MASK
+            else:
+                out[i] = 0.0
+                filter_state = 0.0  # Reset filter when silent
+        return phase, envelope, filter_state
+
+# Minimum interval between status line redraws (~60 Hz)
+STATUS_REFRESH_NS = 16_000_000
+
+# Events between summary lines when stdout is not a terminal
+STATUS_SUMMARY_EVENTS = 100
+
+# Default UDP receive buffer, large enough to absorb bursts while Python is
+# paused; unless a size is given, the largest the platform allows up to this
+# is used. Probing for an accepted size stops at MIN_RCVBUF_BYTES.
+DEFAULT_RCVBUF_BYTES = 8 * 1024 * 1024
+MIN_RCVBUF_BYTES = 64 * 1024
+
+
+def _read_rmem_max():
+    """net.core.rmem_max in bytes, or None where it can't be read (non-Linux)"""
+    try:
+        with open('/proc/sys/net/core/rmem_max') as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+# Linux socket options the socket module does not export (asm-generic values):
+# the kernel attaches its running count of datagrams dropped at this socket,
+# and the wall-clock time it received each datagram (struct timespec).
+# MIPS, SPARC and PA-RISC number them differently, so the fallback values are
+# only used on architectures known to follow asm-generic
+ASM_GENERIC_SOCKOPTS = (sys.platform.startswith('linux') and
+                        platform.machine().lower().startswith(('x86', 'i386', 'i486', 'i586', 'i686',
+                                                              'amd64', 'arm', 'aarch64', 'riscv')))
+SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40 if ASM_GENERIC_SOCKOPTS else None)
+SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', 35 if ASM_GENERIC_SOCKOPTS else None)
+# struct timespec layouts by payload size: 64-bit time_t (64-bit ABIs, or
+# 32-bit ones with time64) and the legacy 32-bit one
+TIMESPEC_LAYOUTS = {16: struct.Struct('=qq'), 8: struct.Struct('=ii')}
+
 # GPIO support (optional, for Raspberry Pi)
 try:
     import RPi.GPIO as GPIO
@@ -82,30 +167,55 @@ class JitterBuffer:
     # Maximum recommended buffer size
     MAX_BUFFER_MS = 1000
     
-    def __init__(self, buffer_ms=100):
+    # Number of recent delay samples kept for statistics
+    STATS_WINDOW = 2048
+    
+    # Queue depth limit; beyond it the earliest pending event is dropped
+    MAX_QUEUE_EVENTS = 1024
+    
+    # Adaptive sizing: re-evaluate every ADAPT_INTERVAL events within
+    # [ADAPT_MIN_MS, ADAPT_MAX_MS]; shrinking needs several windows in a row
+    ADAPT_INTERVAL = 128
+    ADAPT_MIN_MS = 20
+    ADAPT_MAX_MS = 500
+    ADAPT_SHRINK_WINDOWS = 3
+    
+    # SCHED_FIFO priority requested for the playout thread (Linux)
+    REALTIME_PRIORITY = 10
+    
+    # The last stretch before a playout deadline is busy-waited rather than
+    # slept, since condition/sleep wakeups can overshoot by a millisecond or more
+    SPIN_NS = 1_000_000
+    
+    def __init__(self, buffer_ms=100, adaptive=False):
         """
         Initialize jitter buffer with RELATIVE timing
         
+        Scheduling runs on time.monotonic_ns() integers; the float-seconds
+        times taken by add_event()/add_event_ts() are converted on entry.
+        
         Args:
             buffer_ms: Buffer depth in milliseconds (recommended: 50-200ms, max: 1000ms)
+            adaptive: Resize the buffer from the measured jitter (WAN use)
         """
         # Validate buffer size
         if buffer_ms > self.MAX_BUFFER_MS:
             print(f"[WARNING] Buffer size {buffer_ms}ms exceeds recommended maximum of {self.MAX_BUFFER_MS}ms")
             print(f"[WARNING] This will cause {buffer_ms}ms audio delay - consider using smaller buffer")
         
-        self.buffer_ms = buffer_ms
-        self.event_queue = queue.PriorityQueue()
+        self._set_buffer_ms(buffer_ms)
+        # Pending events as a heap of (playout_ns, tiebreak, key_down, duration_ms);
+        # the condition wakes the playout thread when an event is added
+        self._heap = []
+        self._cv = threading.Condition()
+        self._tiebreak = itertools.count()
         self.running = False
         self.callback = None
-        self.last_event_end_time = None  # When previous event finishes
-        self.last_arrival = None
+        self.last_event_end_time_ns = None  # When previous event finishes (monotonic)
+        self.last_arrival_ns = None  # Caller's arrival clock, only used for gaps
         
         # Statistics tracking
-        self.stats_delays = []  # Delay between playout time and arrival
-        self.stats_shifts = 0
-        self.stats_shift_after_gap = 0  # Shifts after >100ms arrival gap (manual keying)
-        self.stats_max_queue = 0
+        self.reset_stats()  # Delay statistics, shift counters, max queue depth
         
         # Adaptive word space detection
         self.word_space_base_threshold = 0.250  # 250ms base threshold (increased from 200ms for WiFi)
@@ -118,14 +228,77 @@ class JitterBuffer:
         self.suppress_state_errors = False  # Suppress errors during FEC recovery with gaps
         
         # Watchdog for stuck key-down detection
-        self.last_key_down_time = None  # When key last went down
-        self.last_activity_time = None  # When last event was added (for stuck detection)
-        # Stuck timeout adapts to buffer size (minimum 2s, or 2x buffer size)
-        self.max_stuck_duration = max(2.0, (buffer_ms * 2) / 1000.0)
+        self.last_key_down_time_ns = None  # When key last went down
+        self.last_activity_time_ns = None  # When last event was added (for stuck detection)
+        # Stuck timeout (max_stuck_ns) follows buffer size: see _set_buffer_ms()
+        
+        # Adaptive buffer sizing (off by default; LAN use wants a fixed buffer)
+        self.adaptive = adaptive
+        # Welford running mean/variance of buffer consumption (ns) since last check
+        self._use_count = 0
+        self._use_mean = 0.0
+        self._use_m2 = 0.0
+        self._shrink_votes = 0
         
         # Debug mode
         self.debug = False
         
+    def _set_buffer_ms(self, buffer_ms):
+        """Change the buffer depth (and the stuck-key timeout that follows it)"""
+        self.buffer_ms = buffer_ms
+        self.buffer_ns = buffer_ms * 1_000_000
+        self.max_stuck_ns = max(2_000_000_000, self.buffer_ns * 2)
+    
+    def _adapt_buffer(self, used_ns, key_down):
+        """
+        Collect buffer consumption and resize the buffer every ADAPT_INTERVAL events
+        
+        Raw arrival gaps mostly reflect keying rhythm, so jitter is measured on
+        how much of the buffer each event consumed before its playout time:
+        its spread (3 sigma, kept with Welford's online update so no samples
+        are stored) is what the buffer has to absorb.
+        
+        Args:
+            used_ns: buffer_ns minus this event's headroom (before any late shift)
+            key_down: State of the event being scheduled
+            
+        Returns:
+            Extra delay (ns) to add to this event's playout time
+        """
+        self._use_count += 1
+        delta = used_ns - self._use_mean
+        self._use_mean += delta / self._use_count
+        self._use_m2 += delta * (used_ns - self._use_mean)
+        # Only resize ahead of a key-down: the added delay lands in a key-up gap
+        if self._use_count < self.ADAPT_INTERVAL or not key_down:
+            return 0
+        
+        jitter_ms = 3.0 * (self._use_m2 / (self._use_count - 1)) ** 0.5 / 1e6
+        self._use_count = 0
+        self._use_mean = 0.0
+        self._use_m2 = 0.0
+        target_ms = int(max(self.ADAPT_MIN_MS, min(self.ADAPT_MAX_MS, jitter_ms)))
+        
+        if target_ms > self.buffer_ms + 10:
+            self._shrink_votes = 0
+        elif target_ms < self.buffer_ms - 20:
+            # Shrink only after sustained low usage
+            self._shrink_votes += 1
+            if self._shrink_votes < self.ADAPT_SHRINK_WINDOWS:
+                return 0
+            self._shrink_votes = 0
+        else:
+            self._shrink_votes = 0
+            return 0
+        
+        old_ms = self.buffer_ms
+        self._set_buffer_ms(target_ms)
+        print(f"\n[INFO] Jitter buffer resized: {old_ms}ms -> {target_ms}ms (jitter: {jitter_ms:.0f}ms)")
+        
+        # Growing delays the running timeline now; shrinking takes effect at
+        # the next timeline reset instead of compressing queued events
+        return max(0, target_ms - old_ms) * 1_000_000
+    
     def _update_gap_statistics(self, gap_ms):
         """Track recent gaps to distinguish network delays from intentional pauses"""
         self.recent_gaps.append(gap_ms)
@@ -179,10 +352,71 @@ class JitterBuffer:
         return gap_ms >= adaptive_threshold
     
     def add_event(self, key_down, duration_ms, arrival_time):
-        """Add event to buffer using RELATIVE timing to preserve tempo"""
+        """
+        Add event to buffer using RELATIVE timing to preserve tempo
+        
+        Args:
+            key_down: Key state
+            duration_ms: Duration in milliseconds
+            arrival_time: Packet arrival time in float seconds; only differences
+                          between arrivals are used, so any consistent clock works
+        """
+        self.add_event_ns(key_down, duration_ms, int(arrival_time * 1e9))
+    
+    def add_event_ns(self, key_down, duration_ms, arrival_ns):
+        """
+        Add event with an integer-nanosecond arrival time (see add_event)
+        
+        Args:
+            key_down: Key state
+            duration_ms: Duration in milliseconds
+            arrival_ns: Packet arrival time in ns, e.g. time.monotonic_ns()
+        """
+        playout_ns = self._schedule_event(key_down, duration_ms, arrival_ns, time.monotonic_ns())
+        self._push_events(((playout_ns, key_down, duration_ms),))
+    
+    def add_events(self, events, arrival_time):
+        """
+        Add all events of one packet (see add_event)
+        
+        Args:
+            events: List of (key_down, duration_ms) tuples, in packet order
+            arrival_time: Packet arrival time in float seconds
+        """
+        self.add_events_ns(events, int(arrival_time * 1e9))
+    
+    def add_events_ns(self, events, arrival_ns):
+        """
+        Add all events of one packet with an integer-nanosecond arrival time
+        
+        Events are scheduled one after another exactly as add_event_ns() would,
+        then queued in a single critical section: one lock acquisition and one
+        playout-thread wakeup per packet instead of per event.
         
+        Args:
+            events: List of (key_down, duration_ms) tuples, in packet order
+            arrival_ns: Packet arrival time in ns, e.g. time.monotonic_ns()
+        """
+        now_ns = time.monotonic_ns()
+        self._push_events([(self._schedule_event(key_down, duration_ms, arrival_ns, now_ns),
+                            key_down, duration_ms)
+                           for key_down, duration_ms in events])
+    
+    def _schedule_event(self, key_down, duration_ms, arrival_ns, now_ns):
+        """
+        Compute one event's playout time and advance the relative timeline
+        
+        Args:
+            key_down: Key state
+            duration_ms: Duration in milliseconds
+            arrival_ns: Packet arrival time in ns
+            now_ns: Current time.monotonic_ns()
+        
+        Returns:
+            Playout time in monotonic ns
+        """
         # Update activity time for watchdog
-        self.last_activity_time = time.time()
+        self.last_activity_time_ns = now_ns
         
         # Validate state transition (DOWN/UP must alternate)
         if self.expected_key_state is not None and key_down == self.expected_key_state:
@@ -194,83 +428,71 @@ class JitterBuffer:
         self.expected_key_state = key_down  # Track last state seen
         
         # Reset if there's a long gap (>2 seconds) between transmissions
-        if self.last_arrival and (arrival_time - self.last_arrival) > 2.0:
-            self.last_event_end_time = None
+        if self.last_arrival_ns is not None and (arrival_ns - self.last_arrival_ns) > 2_000_000_000:
+            self.last_event_end_time_ns = None
             # Clear old events from queue
-            while not self.event_queue.empty():
-                try:
-                    self.event_queue.get_nowait()
-                except queue.Empty:
-                    break
-        
-        # Calculate playout time using RELATIVE timing
-        # Each event starts when the previous event ends (preserves tempo)
-        now = time.time()
+            self.clear_queue()
         
         # Track arrival gap for debug and statistics
-        arrival_gap = 0
-        if self.last_arrival:
-            arrival_gap = arrival_time - self.last_arrival
+        arrival_gap_ms = 0
+        if self.last_arrival_ns is not None:
+            arrival_gap_ms = (arrival_ns - self.last_arrival_ns) / 1e6
             # Update gap statistics for adaptive word space detection
-            self._update_gap_statistics(arrival_gap * 1000)  # Convert to ms
+            self._update_gap_statistics(arrival_gap_ms)
         
-        if self.debug and arrival_gap > 0:
-            print(f"\n[DEBUG] Arrival gap: {arrival_gap*1000:.1f}ms, Duration: {duration_ms}ms, State: {'DOWN' if key_down else 'UP'}")
+        if self.debug and arrival_gap_ms > 0:
+            print(f"\n[DEBUG] Arrival gap: {arrival_gap_ms:.1f}ms, Duration: {duration_ms}ms, State: {'DOWN' if key_down else 'UP'}")
             # Show adaptive detection details
-            is_ws = self._is_word_space(arrival_gap * 1000)
-            print(f"[DEBUG] _is_word_space({arrival_gap*1000:.1f}ms) = {is_ws}, samples={len(self.recent_gaps)}")
+            is_ws = self._is_word_space(arrival_gap_ms)
+            print(f"[DEBUG] _is_word_space({arrival_gap_ms:.1f}ms) = {is_ws}, samples={len(self.recent_gaps)}")
         
         # Detect word space gaps using adaptive detection
         # Reset timeline to prevent "late event" shifts
-        if self.last_event_end_time is not None and arrival_gap > 0 and self._is_word_space(arrival_gap * 1000):
+        if self.last_event_end_time_ns is not None and arrival_gap_ms > 0 and self._is_word_space(arrival_gap_ms):
             if self.debug:
-                print(f"[DEBUG] Word space detected ({arrival_gap*1000:.0f}ms gap) - resetting timeline to maintain buffer")
+                print(f"[DEBUG] Word space detected ({arrival_gap_ms:.0f}ms gap) - resetting timeline to maintain buffer")
             # Reset timeline: schedule this event with full buffer headroom
-            self.last_event_end_time = None
+            self.last_event_end_time_ns = None
         
-        if self.last_event_end_time is None:
+        # Calculate playout time using RELATIVE timing
+        # Each event starts when the previous event ends (preserves tempo)
+        if self.last_event_end_time_ns is None:
             # First event OR post-word-space: schedule buffer_ms from now
-            playout_time = now + self.buffer_ms / 1000.0
+            playout_ns = now_ns + self.buffer_ns
             if self.debug:
                 print(f"[DEBUG] First event: playout in {self.buffer_ms}ms")
         else:
             # Subsequent events: start when previous event finished
             # Trust the packet timing - it already encodes correct durations
-            playout_time = self.last_event_end_time
+            playout_ns = self.last_event_end_time_ns
             
             if self.debug:
-                delay_to_playout = (playout_time - now) * 1000
-                print(f"[DEBUG] Scheduled playout: {delay_to_playout:.1f}ms from now")
+                print(f"[DEBUG] Scheduled playout: {(playout_ns - now_ns) / 1e6:.1f}ms from now")
+        
+        if self.adaptive:
+            playout_ns += self._adapt_buffer(now_ns + self.buffer_ns - playout_ns, key_down)
         
         # ADAPTIVE: If event would be late, shift it forward
-        if playout_time < now:
-            lateness = (now - playout_time) * 1000
-            # Event is late - shift forward with minimal margin
-            playout_time = now + 0.01
+        if playout_ns < now_ns:
+            lateness_ms = (now_ns - playout_ns) / 1e6
+            # Event is late - shift forward with minimal margin (10ms)
+            playout_ns = now_ns + 10_000_000
             self.stats_shifts += 1
             
             # Track if this shift was after a long arrival gap (manual keying pattern)
-            if arrival_gap > 0.1:
+            if arrival_gap_ms > 100:
                 self.stats_shift_after_gap += 1
             
             if self.debug:
-                print(f"[DEBUG] LATE EVENT! Shifted by {lateness:.1f}ms (gap: {arrival_gap*1000:.1f}ms)")
+                print(f"[DEBUG] LATE EVENT! Shifted by {lateness_ms:.1f}ms (gap: {arrival_gap_ms:.1f}ms)")
         
         # Track headroom AFTER adaptive shift (time from NOW until playout)
-        time_until_playout = playout_time - now
-        self.stats_delays.append(time_until_playout * 1000.0)
-        
-        # Add to priority queue (sorted by playout time)
-        self.event_queue.put((playout_time, key_down, duration_ms))
-        
-        # Track max queue depth
-        queue_size = self.event_queue.qsize()
-        if queue_size > self.stats_max_queue:
-            self.stats_max_queue = queue_size
+        self._record_delay(playout_ns - now_ns)
         
         # Track when THIS event will end (for scheduling next event)
-        self.last_event_end_time = playout_time + duration_ms / 1000.0
-        self.last_arrival = arrival_time
+        self.last_event_end_time_ns = playout_ns + duration_ms * 1_000_000
+        self.last_arrival_ns = arrival_ns
+        return playout_ns
     
     def add_event_ts(self, key_down, duration_ms, sender_event_time):
         """
@@ -279,40 +501,97 @@ class JitterBuffer:
         Args:
             key_down: Key state
             duration_ms: Duration in milliseconds
-            sender_event_time: Absolute time when sender generated this event (in receiver's clock)
+            sender_event_time: Absolute time when sender generated this event
+                               (receiver's time.time() clock)
         """
         arrival_time = time.time()
-        now = arrival_time
+        now_ns = time.monotonic_ns()
         
-        # Schedule playout: sender's event time + buffer headroom
-        playout_time = sender_event_time + self.buffer_ms / 1000.0
+        # Schedule playout: sender's event time + buffer headroom, mapped
+        # from the wall clock onto the monotonic clock
+        playout_ns = now_ns + int((sender_event_time - arrival_time) * 1e9) + self.buffer_ns
         
         if self.debug:
-            delay_to_playout = (playout_time - now) * 1000
-            print(f"[DEBUG] TS-based scheduling: {delay_to_playout:.1f}ms from now")
+            print(f"[DEBUG] TS-based scheduling: {(playout_ns - now_ns) / 1e6:.1f}ms from now")
+        
+        if self.adaptive:
+            playout_ns += self._adapt_buffer(now_ns + self.buffer_ns - playout_ns, key_down)
         
         # ADAPTIVE: If event would be late, shift it forward
-        if playout_time < now:
-            lateness = (now - playout_time) * 1000
-            playout_time = now + 0.01
+        if playout_ns < now_ns:
+            lateness_ms = (now_ns - playout_ns) / 1e6
+            playout_ns = now_ns + 10_000_000
             self.stats_shifts += 1
             
             if self.debug:
-                print(f"[DEBUG] LATE EVENT! Shifted by {lateness:.1f}ms")
+                print(f"[DEBUG] LATE EVENT! Shifted by {lateness_ms:.1f}ms")
         
         # Track headroom
-        time_until_playout = playout_time - now
-        self.stats_delays.append(time_until_playout * 1000.0)
+        self._record_delay(playout_ns - now_ns)
         
         # Add to queue
-        self.event_queue.put((playout_time, key_down, duration_ms))
+        self._push_events(((playout_ns, key_down, duration_ms),))
         
-        # Track max queue depth
-        queue_size = self.event_queue.qsize()
-        if queue_size > self.stats_max_queue:
-            self.stats_max_queue = queue_size
+        self.last_arrival_ns = now_ns  # Same monotonic clock as add_event_ns()
+    
+    def _record_delay(self, delay_ns):
+        """Fold one arrival-to-playout delay into the running statistics (O(1))"""
+        self.stats_delays.append(delay_ns)
+        self.stats_delay_count += 1
+        self.stats_delay_sum += delay_ns
+        if delay_ns < self.stats_delay_min:
+            self.stats_delay_min = delay_ns
+        if delay_ns > self.stats_delay_max:
+            self.stats_delay_max = delay_ns
+    
+    def _push_events(self, entries):
+        """
+        Queue events for playout and wake the playout thread
         
-        self.last_arrival = arrival_time
+        Args:
+            entries: Iterable of (playout_ns, key_down, duration_ms) tuples
+        """
+        heap = self._heap
+        tiebreak = self._tiebreak
+        with self._cv:
+            for playout_ns, key_down, duration_ms in entries:
+                heapq.heappush(heap, (playout_ns, next(tiebreak), key_down, duration_ms))
+            
+            # Bound memory if the playout side falls behind: drop the oldest
+            queue_size = len(heap)
+            if queue_size > self.MAX_QUEUE_EVENTS:
+                dropped = queue_size - self.MAX_QUEUE_EVENTS
+                for _ in range(dropped):
+                    heapq.heappop(heap)
+                queue_size -= dropped
+                self.stats_overflows += dropped
+                if self.stats_overflows == dropped or self.debug:  # First overflow
+                    print(f"\n[WARNING] Jitter buffer full ({self.MAX_QUEUE_EVENTS} events) - dropping oldest")
+            
+            # Track max queue depth
+            if queue_size > self.stats_max_queue:
+                self.stats_max_queue = queue_size
+            
+            # notify_all: drain_buffer() may be waiting on the same condition
+            self._cv.notify_all()
+    
+    def clear_queue(self):
+        """
+        Drop all pending events
+        
+        Returns:
+            Number of events dropped
+        """
+        with self._cv:
+            dropped = len(self._heap)
+            self._heap.clear()
+            self._cv.notify_all()
+        return dropped
+    
+    @property
+    def queued_events(self):
+        """Number of events waiting for playout"""
+        return len(self._heap)
     
     def start(self, callback):
         """Start playout thread
@@ -325,78 +604,126 @@ class JitterBuffer:
         self.thread = threading.Thread(target=self._playout_loop, daemon=True)
         self.thread.start()
     
+    def _set_realtime_priority(self):
+        """
+        Move the calling thread to SCHED_FIFO so playout isn't delayed by the
+        receive loop or background load (Linux only)
+        
+        Needs root, CAP_SYS_NICE or an rtprio limit (e.g. `ulimit -r 20`);
+        otherwise the thread keeps normal scheduling.
+        
+        Returns:
+            True if SCHED_FIFO was granted
+        """
+        try:
+            # pid 0 = calling thread on Linux
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.REALTIME_PRIORITY))
+        except (AttributeError, OSError) as e:
+            if self.debug:
+                print(f"[DEBUG] Realtime priority unavailable for playout thread: {e}")
+            return False
+        if self.debug:
+            print(f"[DEBUG] Playout thread running SCHED_FIFO priority {self.REALTIME_PRIORITY}")
+        return True
+    
     def _playout_loop(self):
         """Play out events at the right time"""
+        # A SCHED_FIFO thread spinning on a single core would starve the
+        # receive loop and the audio callback, so it only sleeps there
+        spin_ns = self.SPIN_NS
+        if self._set_realtime_priority() and os.cpu_count() == 1:
+            spin_ns = 0
+        
         while self.running:
-            # Check for stuck key-down state (no activity while key is down)
-            if self.last_key_down_time is not None and self.last_activity_time is not None:
-                time_since_activity = time.time() - self.last_activity_time
-                if time_since_activity > self.max_stuck_duration:
-                    print(f"\n[WARNING] Key stuck DOWN (no activity for {time_since_activity:.1f}s) - forcing UP")
-                    # Force key up to recover from stuck state
-                    if self.callback:
-                        self.callback(False, 10)  # Short UP event to reset
-                    self.last_key_down_time = None
-                    self.expected_key_state = False  # Reset to UP state
-            
-            try:
-                # Get next event (non-blocking with timeout)
-                playout_time, key_down, duration_ms = self.event_queue.get(timeout=0.01)
-                
-                # Wait until playout time
-                now = time.time()
-                delay = playout_time - now
+            spin_until_ns = None
+            with self._cv:
+                now_ns = time.monotonic_ns()
                 
-                if delay > 0:
-                    time.sleep(delay)
-                elif delay < -0.5:
-                    # Event is very late (>500ms), skip it
-                    print(f"\n[WARNING] Dropped late event (delay: {-delay*1000:.0f}ms)")
-                    continue
+                # Stuck key-down watchdog: fires when the key is held down and
+                # no event has arrived for max_stuck_ns
+                watchdog_ns = None
+                if self.last_key_down_time_ns is not None and self.last_activity_time_ns is not None:
+                    watchdog_ns = self.last_activity_time_ns + self.max_stuck_ns
+                stuck = watchdog_ns is not None and now_ns >= watchdog_ns
                 
-                # Track key-down time for watchdog
-                if key_down:
-                    self.last_key_down_time = time.time()
-                else:
-                    self.last_key_down_time = None
-                
-                # Play out event
+                if not stuck:
+                    next_ns = self._heap[0][0] if self._heap else None
+                    if next_ns is None or next_ns > now_ns:
+                        # Sleep until the next event or the watchdog deadline,
+                        # whichever is first; add_event() and stop() cut it short
+                        wake_ns = min((t for t in (next_ns, watchdog_ns) if t is not None), default=None)
+                        # Only event edges need sub-millisecond accuracy, not the watchdog
+                        edge_spin_ns = spin_ns if wake_ns == next_ns else 0
+                        if wake_ns is None or wake_ns - now_ns > edge_spin_ns:
+                            self._cv.wait(None if wake_ns is None else (wake_ns - now_ns - edge_spin_ns) / 1e9)
+                            continue
+                        spin_until_ns = wake_ns  # Spun below, outside the lock
+                    else:
+                        delay_ns = next_ns - now_ns
+                        _, _, key_down, duration_ms = heapq.heappop(self._heap)
+                        self._cv.notify_all()  # Let drain_buffer() see the queue shrink
+            
+            if spin_until_ns is not None:
+                # Final stretch: spin for sub-millisecond edge accuracy,
+                # yielding the GIL to the receive loop on every pass
+                while self.running and time.monotonic_ns() < spin_until_ns:
+                    time.sleep(0)
+                continue
+            
+            if stuck:
+                time_since_activity = (now_ns - self.last_activity_time_ns) / 1e9
+                print(f"\n[WARNING] Key stuck DOWN (no activity for {time_since_activity:.1f}s) - forcing UP")
+                # Force key up to recover from stuck state
                 if self.callback:
-                    self.callback(key_down, duration_ms)
-                
-            except queue.Empty:
+                    self.callback(False, 10)  # Short UP event to reset
+                self.last_key_down_time_ns = None
+                self.expected_key_state = False  # Reset to UP state
+                continue
+            
+            if delay_ns < -500_000_000:
+                # Event is very late (>500ms), skip it
+                print(f"\n[WARNING] Dropped late event (delay: {-delay_ns / 1e6:.0f}ms)")
                 continue
+            
+            # Track key-down time for watchdog
+            if key_down:
+                self.last_key_down_time_ns = time.monotonic_ns()
+            else:
+                self.last_key_down_time_ns = None
+            
+            # Play out event
+            if self.callback:
+                self.callback(key_down, duration_ms)
     
     def drain_buffer(self, timeout=2.0):
         """Wait for buffer to empty (called on EOT)"""
-        start = time.time()
-        while not self.event_queue.empty() and (time.time() - start) < timeout:
-            time.sleep(0.01)
+        with self._cv:
+            self._cv.wait_for(lambda: not self._heap, timeout=timeout)
         
-        # Note: We deliberately do NOT reset last_event_end_time here
+        # Note: We deliberately do NOT reset last_event_end_time_ns here
         # This allows continuous operation without buffer delay resets
         # Note: We also do NOT reset recent_gaps - network characteristics persist!
         # Only reset state validation to allow starting fresh
         self.expected_key_state = None
-        self.last_key_down_time = None  # Clear watchdog
+        self.last_key_down_time_ns = None  # Clear watchdog
+    
+    def reset_timeline(self):
+        """Forget the playout timeline; the next event gets full buffer headroom"""
+        self.last_event_end_time_ns = None
+        self.last_arrival_ns = None
     
     def reset_connection(self, reason="connection reset"):
         """Full reset for new connection - clears all state including gap statistics"""
         # Clear timing state
-        self.last_event_end_time = None
-        self.last_arrival = None
+        self.reset_timeline()
         
         # Clear queue
-        while not self.event_queue.empty():
-            try:
-                self.event_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.clear_queue()
         
         # Reset state validation
         self.expected_key_state = None
-        self.last_key_down_time = None
-        self.last_activity_time = None
+        self.last_key_down_time_ns = None
+        self.last_activity_time_ns = None
         
         # Reset gap statistics (new connection may have different network characteristics)
         self.recent_gaps = []
@@ -407,8 +734,8 @@ class JitterBuffer:
     def reset_state_tracking(self, reason="FEC block with gaps"):
         """Reset state validation (useful when FEC blocks have gaps)"""
         self.expected_key_state = None
-        self.last_key_down_time = None  # Clear watchdog
-        self.last_activity_time = time.time()  # Reset activity timer
+        self.last_key_down_time_ns = None  # Clear watchdog
+        self.last_activity_time_ns = time.monotonic_ns()  # Reset activity timer
         if self.debug:
             print(f"\n[DEBUG] State tracking reset ({reason})")
     
@@ -420,7 +747,9 @@ class JitterBuffer:
     
     def stop(self):
         """Stop playout thread"""
-        self.running = False
+        with self._cv:
+            self.running = False
+            self._cv.notify_all()
         if hasattr(self, 'thread'):
             self.thread.join(timeout=1.0)
     
@@ -428,39 +757,57 @@ class JitterBuffer:
         """Get buffer statistics"""
         stats = {
             'buffer_ms': self.buffer_ms,
-            'queued_events': self.event_queue.qsize(),
+            'queued_events': len(self._heap),
             'timeline_shifts': self.stats_shifts,
             'timeline_shifts_after_gap': self.stats_shift_after_gap,
-            'max_queue_depth': self.stats_max_queue
+            'max_queue_depth': self.stats_max_queue,
+            'queue_overflows': self.stats_overflows
         }
         
-        if self.stats_delays:
+        if self.stats_delay_count:
             # delays = time from packet arrival until scheduled playout
             # Positive = packet has headroom, negative = packet arrived late
             # Note: avg can exceed buffer_ms when events queue up (later arrivals wait longer)
-            stats['delay_min'] = min(self.stats_delays)
-            stats['delay_avg'] = sum(self.stats_delays) / len(self.stats_delays)
-            stats['delay_max'] = max(self.stats_delays)
-            stats['samples'] = len(self.stats_delays)
+            stats['delay_min'] = self.stats_delay_min / 1e6
+            stats['delay_avg'] = self.stats_delay_sum / self.stats_delay_count / 1e6
+            stats['delay_max'] = self.stats_delay_max / 1e6
+            stats['samples'] = self.stats_delay_count
+            stats['delay_p95'] = self._recent_delay_percentile(95) / 1e6
             # Buffer utilization based on minimum headroom (closest we came to underrun)
             stats['buffer_used'] = self.buffer_ms - stats['delay_min']
         
         return stats
     
+    def _recent_delay_percentile(self, percent):
+        """Percentile (ns) of the delays in the recent STATS_WINDOW samples"""
+        window = list(self.stats_delays)  # Snapshot; add_event() may append meanwhile
+        if NUMPY_AVAILABLE:
+            return float(np.percentile(window, percent))
+        
+        window.sort()
+        return float(window[min(len(window) - 1, len(window) * percent // 100)])
+    
     def reset_stats(self):
         """Reset statistics counters"""
-        self.stats_delays = []
+        # Session min/avg/max are kept as running values; the recent delays
+        # (ns) are kept in a bounded window so long sessions don't grow memory
+        self.stats_delays = collections.deque(maxlen=self.STATS_WINDOW)
+        self.stats_delay_count = 0
+        self.stats_delay_sum = 0
+        self.stats_delay_min = float('inf')
+        self.stats_delay_max = float('-inf')
         self.stats_shifts = 0
         self.stats_shift_after_gap = 0
         self.stats_max_queue = 0
+        self.stats_overflows = 0
 
 
 class SidetoneGenerator:
     """Generate audio sidetone with improved signal quality"""
     
     def __init__(self, frequency=600, sample_rate=48000, device_index=None):
-        self.frequency = frequency
         self.sample_rate = sample_rate
+        self.set_frequency(frequency)
         self.volume = 0.3
         
         if not AUDIO_AVAILABLE:
@@ -481,12 +828,14 @@ class SidetoneGenerator:
                         break
             
             self.stream = self.audio.open(
-                format=pyaudio.paFloat32,
+                format=pyaudio.paInt16,  # 16-bit is ample for a sidetone, half of float32's bytes
                 channels=1,
                 rate=sample_rate,
                 output=True,
                 output_device_index=device_index,
-                frames_per_buffer=128  # Low latency (~2.6ms at 48kHz)
+                frames_per_buffer=128,  # Low latency (~2.6ms at 48kHz)
+                stream_callback=self._audio_callback,
+                start=False  # Started once the renderer state below exists
             )
             
             if device_index is not None:
@@ -498,7 +847,7 @@ class SidetoneGenerator:
             print(f"[AUDIO ERROR] Failed to open audio stream: {e}")
             raise
         
-        self.phase = 0.0
+        self.phase = 0  # 32-bit fixed-point phase (full cycle = 2^32)
         self.key_down = False
         self.envelope = 0.0
         self.target_envelope = 0.0
@@ -511,59 +860,124 @@ class SidetoneGenerator:
         self.filter_state = 0.0
         self.filter_alpha = 0.1  # Low-pass filter coefficient (smoother = lower value)
         
-        # Start audio generation thread
-        self.running = True
-        self.audio_thread = threading.Thread(target=self._audio_loop)
-        self.audio_thread.daemon = True
-        self.audio_thread.start()
+        self._sine_table = np.sin(
+            2.0 * np.pi * np.arange(SINE_TABLE_SIZE) / SINE_TABLE_SIZE).astype(np.float32)
+        self._set_chunk_size(128)  # Match frames_per_buffer for consistency
+        
+        if NUMBA_AVAILABLE:
+            # Compile (or load from cache) now rather than on the first chunk
+            _render_chunk_jit(self._samples, 0, 0.0, 0.0, 0.0, 0, 0.0, self._sine_table, self.filter_alpha)
+        
+        # PortAudio now pulls chunks from its own audio thread
+        self.stream.start_stream()
     
-    def _audio_loop(self):
-        """Audio generation thread with optimized signal generation"""
-        chunk_size = 128  # Match frames_per_buffer for consistency
+    def _set_chunk_size(self, chunk_size):
+        """Precompute the per-block constants for the vectorized renderer"""
+        self.chunk_size = chunk_size
+        block_size = min(chunk_size, RENDER_BLOCK_FRAMES)
+        self._ramp = np.arange(1, block_size + 1, dtype=np.float64)
+        self._steps = np.arange(block_size, dtype=np.float64)
+        # One-pole filter in closed form: y[n] = d^(n+1)*y0 + alpha*d^n * sum_k d^-k * x[k]
+        decay = 1.0 - self.filter_alpha
+        self._filter_decay = decay ** self._ramp
+        self._filter_gain = self.filter_alpha * decay ** self._steps
+        self._filter_growth = decay ** -self._steps
+        # Reused buffers: float32 render target and the int16 PCM handed to
+        # PyAudio without a tobytes() copy
+        self._samples = np.zeros(chunk_size, dtype=np.float32)
+        self._pcm = np.zeros(chunk_size, dtype=np.int16)
+        self._silence = np.zeros(chunk_size, dtype=np.int16)  # Never written to
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio stream callback - renders frame_count samples per call
         
-        # Pre-calculate constants
-        phase_increment = self.frequency / self.sample_rate
-        rise_rate = 1.0 / (self.rise_time * self.sample_rate)
-        fall_rate = 1.0 / (self.fall_time * self.sample_rate)
-        two_pi = 2.0 * np.pi
+        With a fixed frames_per_buffer PortAudio asks for chunk_size frames
+        every time; any other request re-sizes the precomputed constants once.
+        Samples are rendered in float32 and scaled to int16 in one pass into a
+        reused ndarray, returned as-is: PyAudio copies its buffer into the
+        device buffer before the next callback.
+        """
+        if frame_count != self.chunk_size:
+            self._set_chunk_size(frame_count)
         
-        while self.running:
-            # Generate audio chunk
-            samples = np.zeros(chunk_size, dtype=np.float32)
-            
-            for i in range(chunk_size):
-                # Update target envelope based on key state
-                self.target_envelope = 1.0 if self.key_down else 0.0
-                
-                # Smooth envelope transition (exponential attack/release)
-                if self.key_down:
-                    # Attack (key down)
-                    self.envelope = min(self.envelope + rise_rate, self.target_envelope)
-                else:
-                    # Release (key up)
-                    self.envelope = max(self.envelope - fall_rate, self.target_envelope)
-                
-                # Generate sine wave only when envelope > 0 (CPU optimization)
-                if self.envelope > 0.0001:
-                    raw_sample = np.sin(two_pi * self.phase) * self.envelope * self.volume
-                    
-                    # Simple low-pass filter to smooth audio (reduces high-freq artifacts)
-                    self.filter_state += self.filter_alpha * (raw_sample - self.filter_state)
-                    samples[i] = self.filter_state
-                    
-                    # Advance phase
-                    self.phase += phase_increment
-                    if self.phase >= 1.0:
-                        self.phase -= 1.0
-                else:
-                    samples[i] = 0.0
-                    self.filter_state = 0.0  # Reset filter when silent
-            
-            # Output audio
-            try:
-                self.stream.write(samples.tobytes())
-            except:
-                pass
+        # Key up and fully decayed: the chunk is pure silence and rendering
+        # would leave the state unchanged (phase holds, filter already reset)
+        if not self.key_down and self.envelope == 0.0:
+            return (self._silence, pyaudio.paContinue)
+        
+        # Rendered samples stay within [-1, 1], so scaling cannot overflow
+        np.multiply(self._render_chunk(), 32767.0, out=self._pcm, casting='unsafe')
+        return (self._pcm, pyaudio.paContinue)
+    
+    def _render_chunk(self):
+        """
+        Render one chunk of sidetone samples
+        
+        Uses the Numba kernel when available; otherwise a vectorized form of
+        the same per-sample envelope/oscillator/filter loop:
+        - Envelope is a linear attack/release ramp clipped to [0, 1]
+        - Oscillator is a wavetable lookup driven by a 32-bit phase accumulator
+          and only advances while the envelope is audible; since the envelope
+          is monotonic within a chunk, audible samples are contiguous
+        - Low-pass filter is evaluated in closed form and reset when silent
+        Longer chunks are rendered in RENDER_BLOCK_FRAMES blocks, carrying the
+        envelope, phase and filter state from one block to the next.
+        
+        Returns: float32 sample array of length chunk_size (reused each call)
+        """
+        key_down = self.key_down
+        if key_down:
+            rate = 1.0 / (self.rise_time * self.sample_rate)
+        else:
+            rate = -1.0 / (self.fall_time * self.sample_rate)
+        self.target_envelope = 1.0 if key_down else 0.0
+        phase_increment = self.phase_increment
+        
+        if NUMBA_AVAILABLE:
+            self.phase, self.envelope, self.filter_state = _render_chunk_jit(
+                self._samples, self.phase, self.envelope, self.filter_state, rate,
+                phase_increment, self.volume, self._sine_table, self.filter_alpha)
+            return self._samples
+        
+        samples = self._samples
+        block_size = len(self._ramp)
+        for start in range(0, self.chunk_size, block_size):
+            self._render_block(samples[start:start + block_size], rate, phase_increment)
+        return samples
+    
+    def _render_block(self, out, rate, phase_increment):
+        """
+        Vectorized render of one block (at most RENDER_BLOCK_FRAMES samples)
+        
+        Args:
+            out: float32 view to fill
+            rate: Envelope change per sample (negative while releasing)
+            phase_increment: Oscillator phase step per audible sample
+        """
+        n = len(out)
+        
+        # Envelope ramp (attack when key down, release when key up)
+        envelope = np.clip(self.envelope + self._ramp[:n] * rate, 0.0, 1.0)
+        self.envelope = float(envelope[-1])
+        
+        # Generate sine wave only where envelope > 0 (silent samples hold phase)
+        audible = envelope > 0.0001
+        audible_before = np.cumsum(audible) - audible
+        phases = (self.phase + audible_before * phase_increment) & PHASE_MASK
+        self.phase = (self.phase + int(np.count_nonzero(audible)) * phase_increment) & PHASE_MASK
+        sine = self._sine_table[phases >> (PHASE_BITS - SINE_TABLE_BITS)]
+        raw = sine * envelope * self.volume
+        raw[~audible] = 0.0
+        
+        # Simple low-pass filter to smooth audio (reduces high-freq artifacts)
+        state = self.filter_state if audible[0] else 0.0
+        samples = (self._filter_decay[:n] * state +
+                   self._filter_gain[:n] * np.cumsum(raw * self._filter_growth[:n]))
+        samples[~audible] = 0.0  # Reset filter when silent
+        self.filter_state = float(samples[-1])
+        
+        np.copyto(out, samples, casting='same_kind')
     
     def set_key(self, key_down):
         """Set key state"""
@@ -576,35 +990,69 @@ class SidetoneGenerator:
     def set_frequency(self, frequency):
         """Set sidetone frequency in Hz"""
         self.frequency = frequency
+        # Fixed-point phase step per sample, cached for the renderer
+        self.phase_increment = int(round(frequency / self.sample_rate * (1 << PHASE_BITS)))
     
     def close(self):
         """Cleanup"""
         if not AUDIO_AVAILABLE:
             return
         
-        self.running = False
-        if hasattr(self, 'audio_thread'):
-            self.audio_thread.join(timeout=1.0)
-        self.stream.stop_stream()
+        self.stream.stop_stream()  # Waits for any in-flight callback
         self.stream.close()
         self.audio.terminate()
 
 
 class CWReceiver:
-    def __init__(self, port=UDP_PORT, enable_audio=True, jitter_buffer_ms=0, debug=False):
+    # Status line key indicator, built once
+    _BAR_DOWN = "[" + "█" * 40 + "] DOWN"
+    _BAR_UP = "[" + " " * 40 + "] UP  "
+    
+    # Network statistics block, filled from JitterBuffer.get_stats() plus
+    # the derived fields computed in _show_stats()
+    # Note: avg delay can exceed buffer size when events queue up (later events wait longer)
+    _STATS_TEMPLATE = (
+        "\n" + "=" * 60 + "\n"
+        "NETWORK STATISTICS\n" +
+        "=" * 60 + "\n"
+        "Buffer size:      {buffer_ms}ms\n"
+        "Max delay seen:   {buffer_used:.1f}ms ({usage_percent:.0f}% of buffer)\n"
+        "Min delay seen:   {delay_min:.1f}ms\n"
+        "Avg delay:        {delay_avg:.1f}ms (arrival-to-playout)\n"
+        "P95 delay:        {delay_p95:.1f}ms (last {window} events)\n"
+        "Timeline shifts:  {timeline_shifts}\n"
+        "{shift_breakdown}"
+        "Max queue depth:  {max_queue_depth}\n"
+        "{overflows}"
+        "Current queue:    {queued_events}\n"
+        "Samples:          {samples}\n"
+        "\n"
+        "{recommendation}\n" +
+        "=" * 60 + "\n\n")
+    
+    def __init__(self, port=UDP_PORT, enable_audio=True, jitter_buffer_ms=0, debug=False,
+                 adaptive_jitter=False, rcvbuf_bytes=None):
         self.port = port
         self.jitter_buffer_ms = jitter_buffer_ms
         self.debug = debug
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         
-        # Increase UDP receive buffer to handle bursts
-        # Default is often 128KB, we set to 1MB
-        try:
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024*1024)
-        except:
-            pass  # Ignore if not supported
+        self.socket = self._open_socket(port, rcvbuf_bytes or DEFAULT_RCVBUF_BYTES)
         
-        self.socket.bind(('0.0.0.0', port))
+        # Size actually granted; Linux reports double (bookkeeping overhead)
+        self.rcvbuf_bytes = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if sys.platform.startswith('linux'):
+            self.rcvbuf_bytes //= 2
+        # Only an explicitly requested size that was cut down is worth a
+        # warning; by default the largest allowed buffer is simply used
+        if rcvbuf_bytes is not None and self.rcvbuf_bytes < rcvbuf_bytes:
+            print(f"[WARNING] UDP receive buffer capped at {self.rcvbuf_bytes // 1024} KB "
+                  f"(requested {rcvbuf_bytes // 1024} KB, raise net.core.rmem_max)")
+        elif debug:
+            print(f"[DEBUG] UDP receive buffer: {self.rcvbuf_bytes // 1024} KB")
+        
+        # Preallocated receive buffer (datagrams are parsed in place)
+        self._rxbuf = bytearray(2048)
+        self._rxmv = memoryview(self._rxbuf)
         
         self.protocol = CWProtocol()
         self.stats = CWTimingStats()
@@ -617,15 +1065,31 @@ class CWReceiver:
         # Jitter buffer (optional, for internet/WAN use)
         self.jitter_buffer = None
         if jitter_buffer_ms > 0:
-            self.jitter_buffer = JitterBuffer(jitter_buffer_ms)
+            self.jitter_buffer = JitterBuffer(jitter_buffer_ms, adaptive=adaptive_jitter)
             self.jitter_buffer.debug = debug
         
         self.last_sequence = -1
         self.packet_count = 0
         self.lost_packets = 0
-        self.last_packet_time = 0
+        self.duplicate_packets = 0
+        self.socket_drops = 0  # Dropped by the kernel (receive buffer full)
+        self._socket_drop_count = 0  # Last cumulative SO_RXQ_OVFL count
+        self.last_packet_ns = None  # time.monotonic_ns() of last packet
         self.stats_update_counter = 0
-        self.last_stats_time = time.time()
+        self.last_stats_time = time.monotonic()
+        self._build_status_line()
+        
+        # Redirected output (log file, pipe, systemd) gets no bar, only a
+        # summary line every STATUS_SUMMARY_EVENTS events
+        self._is_tty = sys.stdout.isatty()
+        self._next_summary = STATUS_SUMMARY_EVENTS
+        
+        # Terminal output runs on its own thread: the receive loop and the
+        # playout callback only publish the latest state and wake it
+        self._status_pending = None  # Latest (key_down, duration_ms, seq)
+        self._stats_pending = False
+        self._display_wake = threading.Event()
+        self._display_running = False
         
         print(f"CW Receiver listening on port {port}")
         if self.sidetone:
@@ -634,11 +1098,89 @@ class CWReceiver:
             print("Audio sidetone disabled (visual only)")
         if self.jitter_buffer:
             print(f"Jitter buffer enabled ({jitter_buffer_ms}ms) for WAN use")
+            if adaptive_jitter:
+                print("Adaptive jitter buffer: resizes from measured jitter")
             print("Statistics will update every 10 packets")
         else:
             print("Jitter buffer disabled (LAN mode)")
         print("-" * 60)
     
+    @staticmethod
+    def _open_socket(port, rcvbuf_bytes=DEFAULT_RCVBUF_BYTES):
+        """Create and bind the UDP receive socket"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        # Increase UDP receive buffer to handle bursts (default is often 128KB).
+        # Linux silently clamps to net.core.rmem_max, so don't ask for more;
+        # platforms that reject an oversized value (ENOBUFS on BSD/macOS) are
+        # probed downward until one is accepted
+        size = rcvbuf_bytes
+        rmem_max = _read_rmem_max()
+        if rmem_max is not None:
+            size = min(size, rmem_max)
+        while True:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+                break
+            except OSError:
+                if size <= MIN_RCVBUF_BYTES:
+                    break  # Keep the OS default
+                size //= 2
+        
+        # Ask for the kernel's drop count with each datagram, so overflows are
+        # counted even when sequence tracking would call them a new transmission
+        if SO_RXQ_OVFL is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            except OSError:
+                pass
+        
+        # Kernel receive timestamps: taken in the network stack, so they don't
+        # include the time until Python gets around to reading the datagram
+        if SO_TIMESTAMPNS is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+            except OSError:
+                pass
+        
+        sock.bind(('0.0.0.0', port))
+        return sock
+    
+    @staticmethod
+    def _recvmsg_into(sock):
+        """
+        Return sock.recvmsg_into, or an equivalent without ancillary data
+        
+        Args:
+            sock: UDP socket
+        
+        Returns:
+            Function(buffers, ancbufsize) -> (nbytes, ancdata, msg_flags, address)
+        """
+        if hasattr(sock, 'recvmsg_into'):
+            return sock.recvmsg_into
+        
+        # No recvmsg (Windows): plain recvfrom_into, no ancillary data
+        recvfrom_into = sock.recvfrom_into
+        def recvmsg_into(buffers, ancbufsize=0):
+            nbytes, address = recvfrom_into(buffers[0])
+            return nbytes, [], 0, address
+        return recvmsg_into
+    
+    def _count_socket_drops(self, data):
+        """
+        Fold one SO_RXQ_OVFL control message into socket_drops
+        
+        Args:
+            data: Control message payload (cumulative uint32 drop count)
+        """
+        count = int.from_bytes(data[:4], sys.byteorder)
+        dropped = (count - self._socket_drop_count) & 0xFFFFFFFF
+        self._socket_drop_count = count
+        if dropped:
+            self.socket_drops += dropped
+            print(f"\n[WARNING] Kernel dropped {dropped} packet(s) - receive buffer full")
+    
     def _show_stats(self):
         """Display jitter buffer statistics"""
         if not self.jitter_buffer:
@@ -648,53 +1190,47 @@ class CWReceiver:
         if 'delay_min' not in stats:
             return
         
-        print("\n" + "=" * 60)
-        print("NETWORK STATISTICS")
-        print("=" * 60)
-        print(f"Buffer size:      {stats['buffer_ms']}ms")
-        print(f"Max delay seen:   {stats['buffer_used']:.1f}ms ({stats['buffer_used']/stats['buffer_ms']*100:.0f}% of buffer)")
-        print(f"Min delay seen:   {stats['delay_min']:.1f}ms")
-        # Note: avg delay can exceed buffer size when events queue up (later events wait longer)
-        print(f"Avg delay:        {stats['delay_avg']:.1f}ms (arrival-to-playout)")
-        print(f"Timeline shifts:  {stats['timeline_shifts']}")
-        
-        # Show shift breakdown for manual keying vs network jitter
+        # Derived values, computed once
+        buffer_ms = stats['buffer_ms']
         gap_shifts = stats['timeline_shifts_after_gap']
         network_shifts = stats['timeline_shifts'] - gap_shifts
+        usage_percent = (stats['buffer_used'] / buffer_ms) * 100
+        network_jitter_rate = network_shifts / max(1, stats['samples'])
+        avg_delay_percent = (stats['delay_avg'] / buffer_ms) * 100
+        
+        # Show shift breakdown for manual keying vs network jitter
+        shift_breakdown = ""
         if gap_shifts > 0:
-            print(f"  - After gaps:   {gap_shifts} (manual keying pauses)")
+            shift_breakdown += f"  - After gaps:   {gap_shifts} (manual keying pauses)\n"
         if network_shifts > 0:
-            print(f"  - Network:      {network_shifts} (actual jitter)")
-        
-        print(f"Max queue depth:  {stats['max_queue_depth']}")
-        print(f"Current queue:    {stats['queued_events']}")
-        print(f"Samples:          {stats['samples']}")
+            shift_breakdown += f"  - Network:      {network_shifts} (actual jitter)\n"
         
         # Smart recommendations based on actual buffer usage and jitter patterns
-        usage_percent = (stats['buffer_used'] / stats['buffer_ms']) * 100
-        network_jitter_rate = network_shifts / max(1, stats['samples'])
-        avg_delay_percent = (stats['delay_avg'] / stats['buffer_ms']) * 100
-        
         if network_jitter_rate > 0.2:
             # Frequent network-induced shifts (>20% of packets) = real jitter problem
-            print(f"\n⚠️  RECOMMENDATION: Increase buffer to {stats['buffer_ms'] + 50}ms (high network jitter)")
+            recommendation = f"⚠️  RECOMMENDATION: Increase buffer to {buffer_ms + 50}ms (high network jitter)"
         elif usage_percent >= 98 and avg_delay_percent > 50:
             # Hitting ceiling (98%+) AND high average delay (>50%) = sustained high jitter
-            needed = stats['buffer_ms'] + 20
-            print(f"\n⚠️  RECOMMENDATION: Increase buffer to {int(needed)}ms (sustained high delays)")
+            recommendation = f"⚠️  RECOMMENDATION: Increase buffer to {buffer_ms + 20}ms (sustained high delays)"
         elif usage_percent < 60 and gap_shifts == stats['timeline_shifts']:
             # Low usage and all shifts are from gaps = buffer oversized for manual keying
             suggested = max(20, int(stats['buffer_used'] * 1.3))
-            print(f"\n✓ Buffer larger than needed - could reduce to ~{suggested}ms")
+            recommendation = f"✓ Buffer larger than needed - could reduce to ~{suggested}ms"
+        elif avg_delay_percent < 30:
+            # Buffer is adequate; very low average delay = buffer much larger than needed
+            recommendation = f"✓ Buffer size excellent (avg delay only {avg_delay_percent:.0f}% of buffer)"
         else:
-            # Buffer is adequate
-            if avg_delay_percent < 30:
-                # Very low average delay = buffer much larger than needed
-                print(f"\n✓ Buffer size excellent (avg delay only {avg_delay_percent:.0f}% of buffer)")
-            else:
-                print(f"\n✓ Buffer size looks good!")
+            recommendation = "✓ Buffer size looks good!"
+        
+        overflows = ""
+        if stats['queue_overflows']:
+            overflows = f"Queue overflows:  {stats['queue_overflows']} (oldest events dropped)\n"
         
-        print("=" * 60 + "\n")
+        stats.update(usage_percent=usage_percent,
+                     window=min(stats['samples'], JitterBuffer.STATS_WINDOW),
+                     shift_breakdown=shift_breakdown, overflows=overflows,
+                     recommendation=recommendation)
+        print(self._STATS_TEMPLATE.format_map(stats), end='')
     
     def _process_event(self, key_down, duration_ms, seq=0):
         """Process a CW event (called directly or from jitter buffer)"""
@@ -704,7 +1240,7 @@ class CWReceiver:
         # Debug timing
         if self.debug:
             state_name = "DOWN" if key_down else "UP  "
-            print(f"\n[PLAY] {state_name} for {duration_ms}ms at {time.time():.3f}")
+            print(f"\n[PLAY] {state_name} for {duration_ms}ms at {time.monotonic():.3f}")
         
         # Update audio sidetone
         if self.sidetone:
@@ -714,100 +1250,275 @@ class CWReceiver:
         if self.jitter_buffer and self.packet_count % 10 == 0:
             self.stats_update_counter += 1
             if self.stats_update_counter >= 3:  # Every 30 packets
-                self._show_stats()
+                self._stats_pending = True  # Printed by the display thread
+                self._display_wake.set()
                 self.stats_update_counter = 0
         
-        # Visual feedback
-        state_str = "█" * 40 if key_down else " " * 40
-        status = "DOWN" if key_down else "UP  "
+        self._show_status(key_down, duration_ms, seq)
+    
+    def _process_events(self, events, seq=0):
+        """
+        Play out all events of one packet immediately (LAN mode)
+        
+        Events that arrive together are recorded as one batch. The sidetone key
+        state is still set for every event (a plain bool store); only the
+        status line, which does I/O, is updated once with the final state.
+        """
+        self.stats.add_events(events)
+        
+        if self.debug:
+            now = time.monotonic()
+            for key_down, duration_ms in events:
+                state_name = "DOWN" if key_down else "UP  "
+                print(f"\n[PLAY] {state_name} for {duration_ms}ms at {now:.3f}")
+        
+        if self.sidetone:
+            set_key = self.sidetone.set_key
+            for key_down, _ in events:
+                set_key(key_down)
+        
+        key_down, duration_ms = events[-1]
+        self._show_status(key_down, duration_ms, seq)
+    
+    def _show_status(self, key_down, duration_ms, seq):
+        """Publish the key state for the display thread (never blocks on I/O)"""
+        if not self._is_tty:
+            total = len(self.stats.events)
+            if total < self._next_summary:
+                return
+            self._next_summary = total - total % STATUS_SUMMARY_EVENTS + STATUS_SUMMARY_EVENTS
+        self._status_pending = (key_down, duration_ms, seq)
+        self._display_wake.set()
+    
+    def _display_loop(self):
+        """
+        Display thread: redraw the status line and print periodic statistics
+        
+        Updates arriving faster than STATUS_REFRESH_NS coalesce, so only the
+        latest state is drawn and terminal I/O never delays receive/playout.
+        """
+        wake = self._display_wake
+        while True:
+            wake.wait()
+            wake.clear()
+            if not self._display_running:
+                break
+            
+            if self._stats_pending:
+                self._stats_pending = False
+                self._show_stats()
+            
+            status = self._status_pending
+            if status is not None:
+                self._render_status(*status)
+            
+            # Cap the redraw rate
+            time.sleep(STATUS_REFRESH_NS / 1e9)
+    
+    def _render_status(self, key_down, duration_ms, seq):
+        """Redraw the single-line key state display"""
+        if not self._is_tty:
+            queued = f", {self.jitter_buffer.queued_events} queued" if self.jitter_buffer else ""
+            print(f"[STATUS] {len(self.stats.events)} events, {self.packet_count} packets, "
+                  f"{self.lost_packets} lost, seq {seq}{queued}", flush=True)
+            return
         
-        jitter_info = ""
+        # Visual feedback: patch the numeric slots of the prebuilt line
+        patch = self._patch_status_field
+        patch(0, duration_ms)
+        patch(1, seq)
+        patch(2, self.packet_count)
+        patch(3, self.lost_packets)
         if self.jitter_buffer:
-            jitter_stats = self.jitter_buffer.get_stats()
-            jitter_info = f" JBuf:{jitter_stats['queued_events']:2d}"
+            patch(4, self.jitter_buffer.queued_events)
+        bar = self._status_bar_down if key_down else self._status_bar_up
         
-        print(f"\r[{state_str}] {status} {duration_ms:4d}ms | "
-              f"Seq:{seq:3d} Pkts:{self.packet_count:4d} "
-              f"Lost:{self.lost_packets:2d}{jitter_info}",
-              end='', flush=True)
+        out = self._status_out
+        if out is None:
+            sys.stdout.write((bar + self._status_line).decode(self._status_encoding))
+            sys.stdout.flush()
+        else:
+            sys.stdout.flush()  # Keep ordering with pending print() output
+            out.write(bar)
+            out.write(self._status_line)
+            out.flush()
+    
+    def _build_status_line(self):
+        """Lay out the status line once as bytes; numbers are patched in place"""
+        self._status_encoding = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+        self._status_out = getattr(sys.stdout, 'buffer', None)
+        self._status_bar_down = ("\r" + self._BAR_DOWN).encode(self._status_encoding, 'replace')
+        self._status_bar_up = ("\r" + self._BAR_UP).encode(self._status_encoding, 'replace')
+        
+        # Literal pieces and field widths: duration, seq, packets, lost[, queued]
+        parts = [b" ", 4, b"ms | Seq:", 3, b" Pkts:", 4, b" Lost:", 2]
+        if self.jitter_buffer:
+            parts += [b" JBuf:", 2]
+        
+        line = bytearray()
+        slots = []  # [offset, width] per numeric field
+        for part in parts:
+            if isinstance(part, int):
+                slots.append([len(line), part])
+                line += b" " * part
+            else:
+                line += part
+        self._status_line = line
+        self._status_slots = slots
+    
+    def _patch_status_field(self, index, value):
+        """Overwrite one right-aligned numeric field of the status line"""
+        slot = self._status_slots[index]
+        offset, width = slot
+        digits = b"%*d" % (width, value)
+        self._status_line[offset:offset + width] = digits
+        grow = len(digits) - width
+        if grow:
+            # Value outgrew its slot: keep the wider field, shift the rest
+            slot[1] += grow
+            for later in self._status_slots[index + 1:]:
+                later[0] += grow
     
     def run(self):
         """Main receive loop"""
-        # Start jitter buffer playout thread if enabled
+        # Start display thread, then jitter buffer playout thread if enabled
+        self._display_running = True
+        self._display_thread = threading.Thread(target=self._display_loop, daemon=True)
+        self._display_thread.start()
         if self.jitter_buffer:
             self.jitter_buffer.start(lambda kd, dur: self._process_event(kd, dur))
         
+        # Bind per-packet lookups once for the receive loop
+        parse_packet = self.protocol.parse_packet
+        peek_sequence = self.protocol.peek_sequence
+        rxbuf = self._rxbuf
+        rxmv = self._rxmv
+        rxbufs = [rxbuf]
+        ancbufsize = 0
+        if SO_RXQ_OVFL is not None:
+            ancbufsize += socket.CMSG_SPACE(4)
+        if SO_TIMESTAMPNS is not None:
+            ancbufsize += socket.CMSG_SPACE(16)  # Largest timespec layout
+        sol_socket = socket.SOL_SOCKET
+        timespec_layouts = TIMESPEC_LAYOUTS
+        wall_ns = time.time_ns
+        add_events = self.jitter_buffer.add_events_ns if self.jitter_buffer else None
+        now_ns = time.monotonic_ns
+        
+        recvmsg_into = self._recvmsg_into(self.socket)
+        
+        # Wait for readiness, then drain every queued datagram without blocking
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        self.socket.setblocking(False)
+        
         try:
             while True:
-                # Receive packet
-                data, addr = self.socket.recvfrom(1024)
-                receive_time = time.time()
-                
-                # Parse packet
-                parsed = self.protocol.parse_packet(data)
-                if not parsed:
+                if not selector.select(timeout=0.1):
                     continue
                 
-                self.packet_count += 1
-                
-                # Check for lost packets
-                seq = parsed['sequence']
-                time_gap = receive_time - self.last_packet_time if self.last_packet_time > 0 else 0
-                
-                if self.last_sequence >= 0:
-                    expected = (self.last_sequence + 1) % 256
-                    if seq != expected:
-                        lost = (seq - expected) % 256
-                        
-                        # Detect new transmission vs packet loss:
-                        # 1. Large time gap (>2 seconds) = new transmission
-                        # 2. Sequence goes backward (lost >= 100) = likely wrap-around or reset
-                        # 3. Small gap with sequence jump at wrap boundary = wrap-around
-                        # 4. Otherwise = real packet loss
-                        
-                        if time_gap > 2.0:
-                            # Long silence = new transmission starting
-                            print(f"\n[INFO] New transmission detected (silence: {time_gap:.1f}s)")
-                        elif lost >= 100:
-                            # Large backward jump = sequence wrap or reset, not real loss
-                            # This catches wraps like 255→0 (lost=1 in mod256, but 255 backward)
-                            # and also 128→0 (lost=128 in mod256, but is actually wrap)
-                            if self.debug:
-                                print(f"\n[DEBUG] Sequence wrap: {self.last_sequence}→{seq}")
+                while True:
+                    # Receive packet
+                    try:
+                        nbytes, ancdata, _, addr = recvmsg_into(rxbufs, ancbufsize)
+                    except BlockingIOError:
+                        break  # Socket drained
+                    receive_ns = now_ns()
+                    
+                    # Kernel receive time and drop count ride along as
+                    # ancillary data
+                    for cmsg_level, cmsg_type, cmsg_data in ancdata:
+                        if cmsg_level != sol_socket:
+                            continue
+                        if cmsg_type == SO_TIMESTAMPNS:
+                            # Wall clock -> monotonic: back-date by how long
+                            # the datagram waited since the kernel received it
+                            timespec = timespec_layouts.get(len(cmsg_data))
+                            if timespec is not None:
+                                sec, nsec = timespec.unpack(cmsg_data)
+                                queued_ns = wall_ns() - (sec * 1_000_000_000 + nsec)
+                                if queued_ns > 0:
+                                    receive_ns -= queued_ns
+                        elif cmsg_type == SO_RXQ_OVFL:
+                            self._count_socket_drops(cmsg_data)
+                    
+                    # Drop exact duplicates (e.g. a retransmitted datagram)
+                    # before parsing; after a long gap the same number is
+                    # a new transmission instead
+                    if (nbytes >= 4 and peek_sequence(rxbuf) == self.last_sequence and
+                            receive_ns - self.last_packet_ns < 2_000_000_000):
+                        self.duplicate_packets += 1
+                        if self.debug:
+                            print(f"\n[DEBUG] Dropped duplicate packet seq={self.last_sequence}")
+                        continue
+                    
+                    # Parse packet
+                    parsed = parse_packet(rxmv[:nbytes])
+                    if not parsed:
+                        continue
+                    
+                    self.packet_count += 1
+                    
+                    # Check for lost packets
+                    seq = parsed.sequence
+                    gap_ns = receive_ns - self.last_packet_ns if self.last_packet_ns is not None else 0
+                    
+                    if self.last_sequence >= 0:
+                        expected = (self.last_sequence + 1) % 256
+                        if seq != expected:
+                            lost = (seq - expected) % 256
+                            
+                            # Detect new transmission vs packet loss:
+                            # 1. Large time gap (>2 seconds) = new transmission
+                            # 2. Sequence goes backward (lost >= 100) = likely wrap-around or reset
+                            # 3. Small gap with sequence jump at wrap boundary = wrap-around
+                            # 4. Otherwise = real packet loss
+                            
+                            if gap_ns > 2_000_000_000:
+                                # Long silence = new transmission starting
+                                print(f"\n[INFO] New transmission detected (silence: {gap_ns / 1e9:.1f}s)")
+                            elif lost >= 100:
+                                # Large backward jump = sequence wrap or reset, not real loss
+                                # This catches wraps like 255→0 (lost=1 in mod256, but 255 backward)
+                                # and also 128→0 (lost=128 in mod256, but is actually wrap)
+                                if self.debug:
+                                    print(f"\n[DEBUG] Sequence wrap: {self.last_sequence}→{seq}")
+                            else:
+                                # Real packet loss during active transmission
+                                self.lost_packets += lost
+                                print(f"\n[WARNING] Lost {lost} packet(s) - expected {expected}, got {seq}")
+                    
+                    self.last_sequence = seq
+                    self.last_packet_ns = receive_ns
+                    
+                    # Check for End-of-Transmission
+                    if parsed.eot:
+                        print(f"\n[EOT] Transmission complete, draining buffer...", flush=True)
+                        if self.jitter_buffer:
+                            self.jitter_buffer.drain_buffer(timeout=2.0)
+                            print("[EOT] Buffer drained and reset", flush=True)
                         else:
-                            # Real packet loss during active transmission
-                            self.lost_packets += lost
-                            print(f"\n[WARNING] Lost {lost} packet(s) - expected {expected}, got {seq}")
-                
-                self.last_sequence = seq
-                self.last_packet_time = receive_time
-                
-                # Check for End-of-Transmission
-                if parsed.get('eot', False):
-                    print(f"\n[EOT] Transmission complete, draining buffer...", flush=True)
-                    if self.jitter_buffer:
-                        self.jitter_buffer.drain_buffer(timeout=2.0)
-                        print("[EOT] Buffer drained and reset", flush=True)
-                    else:
-                        print("[EOT] No buffer to drain", flush=True)
-                    continue
-                
-                # Process events
-                for key_down, duration_ms in parsed['events']:
+                            print("[EOT] No buffer to drain", flush=True)
+                        continue
+                    
                     # Debug: show what packet was actually received (enable with --debug-packets)
                     if hasattr(self, 'debug_packets') and self.debug_packets:
-                        print(f"\n[RX] Seq:{seq} {'DOWN' if key_down else 'UP  '} {duration_ms:3d}ms", flush=True)
+                        for key_down, duration_ms in parsed.events:
+                            print(f"\n[RX] Seq:{seq} {'DOWN' if key_down else 'UP  '} {duration_ms:3d}ms", flush=True)
+                    
+                    # Process events
+                    if parsed.events:
+                        if add_events:
+                            # Add to jitter buffer for delayed playout (one batch per packet)
+                            add_events(parsed.events, receive_ns)
+                        else:
+                            # Immediate playout (LAN mode)
+                            self._process_events(parsed.events, seq)
                     
-                    if self.jitter_buffer:
-                        # Add to jitter buffer for delayed playout
-                        self.jitter_buffer.add_event(key_down, duration_ms, receive_time)
-                    else:
-                        # Immediate playout (LAN mode)
-                        self._process_event(key_down, duration_ms, seq)
-                
         except KeyboardInterrupt:
             print("\n\nInterrupted")
         finally:
+            selector.close()
             self.cleanup()
     
     def cleanup(self):
@@ -815,6 +1526,11 @@ class CWReceiver:
         if self.jitter_buffer:
             self.jitter_buffer.stop()
         
+        if self._display_running:
+            self._display_running = False
+            self._display_wake.set()
+            self._display_thread.join(timeout=1.0)
+        
         if self.sidetone:
             self.sidetone.close()
         
@@ -833,6 +1549,10 @@ class CWReceiver:
         stats = self.stats.get_stats()
         print(f"Total packets received: {self.packet_count}")
         print(f"Packets lost: {self.lost_packets}")
+        if self.duplicate_packets:
+            print(f"Duplicates dropped: {self.duplicate_packets}")
+        if self.socket_drops:
+            print(f"Dropped by kernel (receive buffer full): {self.socket_drops}")
         if self.packet_count > 0:
             loss_rate = (self.lost_packets / (self.packet_count + self.lost_packets)) * 100
             print(f"Packet loss rate: {loss_rate:.2f}%")
@@ -876,6 +1596,11 @@ if __name__ == '__main__':
     parser.add_argument('--no-audio', action='store_true', help='Disable audio sidetone')
     parser.add_argument('--debug', action='store_true', help='Enable verbose debug output')
     parser.add_argument('--debug-packets', action='store_true', help='Show every received packet')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Resize the jitter buffer from measured jitter (20-500ms)')
+    parser.add_argument('--rcvbuf', type=int, default=None,
+                       help=f'UDP receive buffer in bytes (default: largest allowed, '
+                            f'up to {DEFAULT_RCVBUF_BYTES})')
     
     args = parser.parse_args()
     
@@ -896,7 +1621,9 @@ if __name__ == '__main__':
         print("🐛 DEBUG MODE ENABLED - Verbose timing output\n")
     
     receiver = CWReceiver(args.port, enable_audio=not args.no_audio, 
-                         jitter_buffer_ms=args.jitter_buffer, debug=args.debug)
+                         jitter_buffer_ms=args.jitter_buffer, debug=args.debug,
+                         adaptive_jitter=args.adaptive,
+                         rcvbuf_bytes=args.rcvbuf)
     receiver.debug_packets = args.debug_packets
     if args.debug_packets:
         print("📦 PACKET DEBUG ENABLED - Showing all received packets\n")
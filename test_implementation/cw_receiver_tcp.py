@@ -20,15 +20,21 @@ except ImportError:
     print("Install with: pip3 install pyaudio")
 
 # Import jitter buffer from UDP version
+# (the status line redraw cap is shared with it too)
 try:
-    from cw_receiver import JitterBuffer, SidetoneGenerator
+    from cw_receiver import JitterBuffer, SidetoneGenerator, STATUS_REFRESH_NS
 except ImportError:
     print("Warning: Could not import JitterBuffer/SidetoneGenerator from cw_receiver.py")
     JitterBuffer = None
     SidetoneGenerator = None
+    STATUS_REFRESH_NS = 16_000_000  # cw_receiver.py's value (~60 Hz)
 
 
 class CWReceiverTCP:
+    # Status line key indicator, built once
+    _BAR_DOWN = "\r[" + "█" * 40 + "] DOWN "
+    _BAR_UP = "\r[" + " " * 40 + "] UP   "
+    
     def __init__(self, port=TCP_PORT, enable_audio=True, jitter_buffer_ms=0, debug=False):
         self.port = port
         self.jitter_buffer_ms = jitter_buffer_ms
@@ -55,6 +61,13 @@ class CWReceiverTCP:
         self.last_packet_time = 0
         self.stats_update_counter = 0
         
+        # Status/statistics output is drawn by a renderer thread from the
+        # latest published state, so terminal I/O never delays playout
+        self._status_pending = None  # Latest (key_down, duration_ms, seq)
+        self._stats_pending = False
+        self._render_wake = threading.Event()
+        self._render_running = False
+        
         print(f"CW Receiver TCP listening on port {port}")
         if self.sidetone:
             print("Audio sidetone enabled (700 Hz)")
@@ -131,22 +144,45 @@ class CWReceiverTCP:
         if self.jitter_buffer and self.packet_count % 10 == 0:
             self.stats_update_counter += 1
             if self.stats_update_counter >= 3:  # Every 30 packets
-                self._show_stats()
+                self._stats_pending = True  # Printed by the renderer thread
                 self.stats_update_counter = 0
         
-        # Visual feedback
-        state_str = "█" * 40 if key_down else " " * 40
-        status = "DOWN" if key_down else "UP  "
+        # Visual feedback (drawn by the renderer thread)
+        self._status_pending = (key_down, duration_ms, seq)
+        self._render_wake.set()
+    
+    def _render_loop(self):
+        """Renderer thread: redraw at most once per STATUS_REFRESH_NS"""
+        wake = self._render_wake
+        while True:
+            wake.wait()
+            wake.clear()
+            if not self._render_running:
+                break
+            
+            if self._stats_pending:
+                self._stats_pending = False
+                self._show_stats()
+            
+            status = self._status_pending
+            if status is not None:
+                self._render_status(*status)
+            
+            # Cap the redraw rate; updates meanwhile coalesce into the next one
+            time.sleep(STATUS_REFRESH_NS / 1e9)
+    
+    def _render_status(self, key_down, duration_ms, seq):
+        """Redraw the single-line key state display"""
+        bar = self._BAR_DOWN if key_down else self._BAR_UP
         
         jitter_info = ""
         if self.jitter_buffer:
-            jitter_stats = self.jitter_buffer.get_stats()
-            jitter_info = f" JBuf:{jitter_stats['queued_events']:2d}"
+            jitter_info = f" JBuf:{self.jitter_buffer.queued_events:2d}"
         
-        print(f"\r[{state_str}] {status} {duration_ms:4d}ms | "
-              f"Seq:{seq:3d} Pkts:{self.packet_count:4d} "
-              f"Lost:{self.lost_packets:2d}{jitter_info}",
-              end='', flush=True)
+        sys.stdout.write(f"{bar}{duration_ms:4d}ms | "
+                         f"Seq:{seq:3d} Pkts:{self.packet_count:4d} "
+                         f"Lost:{self.lost_packets:2d}{jitter_info}")
+        sys.stdout.flush()
     
     def run(self):
         """Main receive loop"""
@@ -157,7 +193,10 @@ class CWReceiverTCP:
         
         print(f"[TCP] Server started, waiting for connection...")
         
-        # Start jitter buffer playout thread if enabled
+        # Start renderer thread, then jitter buffer playout thread if enabled
+        self._render_running = True
+        self._render_thread = threading.Thread(target=self._render_loop, daemon=True)
+        self._render_thread.start()
         if self.jitter_buffer:
             self.jitter_buffer.start(lambda kd, dur: self._process_event(kd, dur))
         
@@ -173,18 +212,11 @@ class CWReceiverTCP:
                 if self.jitter_buffer:
                     # Clear ALL state (don't stop the thread!)
                     self.jitter_buffer.reset_state_tracking(reason="new TCP connection")
-                    self.jitter_buffer.last_event_end_time = None
-                    self.jitter_buffer.last_arrival = None
+                    self.jitter_buffer.reset_timeline()
                     self.jitter_buffer.state_errors = 0  # Reset error counter
                     
-                    # Clear queue using get_nowait (avoid deadlock)
-                    queue_size = 0
-                    try:
-                        while True:
-                            self.jitter_buffer.event_queue.get_nowait()
-                            queue_size += 1
-                    except:
-                        pass
+                    # Clear queue
+                    queue_size = self.jitter_buffer.clear_queue()
                     
                     if queue_size > 0 and self.debug:
                         print(f"[TCP] Cleared {queue_size} stale events from buffer")
@@ -218,15 +250,10 @@ class CWReceiverTCP:
                             if self.jitter_buffer:
                                 # Reset state
                                 self.jitter_buffer.reset_state_tracking(reason="client disconnected")
-                                self.jitter_buffer.last_event_end_time = None
-                                self.jitter_buffer.last_arrival = None
+                                self.jitter_buffer.reset_timeline()
                                 
-                                # Clear queue using get_nowait (avoid deadlock)
-                                try:
-                                    while True:
-                                        self.jitter_buffer.event_queue.get_nowait()
-                                except:
-                                    pass
+                                # Clear queue
+                                self.jitter_buffer.clear_queue()
                             
                             self.server.close_client()
                             break
@@ -237,10 +264,10 @@ class CWReceiverTCP:
                     self.packet_count += 1
                     
                     if self.debug:
-                        print(f"\n[DEBUG] Received packet #{self.packet_count}: seq={parsed['sequence']}, events={len(parsed['events'])}")
+                        print(f"\n[DEBUG] Received packet #{self.packet_count}: seq={parsed.sequence}, events={len(parsed.events)}")
                     
                     # Check for lost packets
-                    seq = parsed['sequence']
+                    seq = parsed.sequence
                     time_gap = receive_time - self.last_packet_time if self.last_packet_time > 0 else 0
                     
                     if self.last_sequence >= 0:
@@ -264,7 +291,7 @@ class CWReceiverTCP:
                     self.last_packet_time = receive_time
                     
                     # Check for End-of-Transmission
-                    if parsed.get('eot', False):
+                    if parsed.eot:
                         print(f"\n[EOT] Transmission complete, draining buffer...", flush=True)
                         if self.jitter_buffer:
                             self.jitter_buffer.drain_buffer(timeout=2.0)
@@ -274,11 +301,11 @@ class CWReceiverTCP:
                         continue
                     
                     # Process events
-                    for key_down, duration_ms in parsed['events']:
-                        if self.jitter_buffer:
-                            # Add to jitter buffer for delayed playout
-                            self.jitter_buffer.add_event(key_down, duration_ms, receive_time)
-                        else:
+                    if self.jitter_buffer:
+                        # Add to jitter buffer for delayed playout (one batch per packet)
+                        self.jitter_buffer.add_events(parsed.events, receive_time)
+                    else:
+                        for key_down, duration_ms in parsed.events:
                             # Immediate playout (LAN mode)
                             self._process_event(key_down, duration_ms, seq)
                 
@@ -295,6 +322,11 @@ class CWReceiverTCP:
         if self.jitter_buffer:
             self.jitter_buffer.stop()
         
+        if self._render_running:
+            self._render_running = False
+            self._render_wake.set()
+            self._render_thread.join(timeout=1.0)
+        
         if self.sidetone:
             self.sidetone.close()
         
@@ -95,7 +95,7 @@ def main():
                   f"WPM: {stats_data.get('wpm', 0):.1f}")
             if jitter_buffer and hasattr(jitter_buffer, 'stats_max_queue'):
                 print(f"[BUFFER] Max queue: {jitter_buffer.stats_max_queue}, " +
-                      f"Current: {jitter_buffer.event_queue.qsize()}")
+                      f"Current: {jitter_buffer.queued_events}")
                       
     
     # Start jitter buffer if enabled
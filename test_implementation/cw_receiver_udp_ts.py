@@ -83,9 +83,11 @@ class CWReceiverUDPTimestamp:
         self.protocol.create_socket(self.port)
         self.protocol.sock.settimeout(0.1)  # 100ms timeout for clean shutdown
         
+        recv_packet = self.protocol.recv_packet  # Bound once for the loop
+        
         try:
             while True:
-                result = self.protocol.recv_packet()
+                result = recv_packet()
                 
                 if result is None:
                     continue
@@ -321,10 +321,7 @@ class USBKeySender:
         """Send CW event with timestamp"""
         try:
             # Get current timestamp
-            if self.protocol.transmission_start is None:
-                timestamp_ms = 0
-            else:
-                timestamp_ms = int((time.time() - self.protocol.transmission_start) * 1000)
+            timestamp_ms = self.protocol.elapsed_ms()
             
             self.protocol.send_packet(key_down, int(duration_ms))
             
@@ -203,10 +203,7 @@ class USBKeySenderUDPTimestamp:
         duration_ms = int(duration_ms)
         
         # Get current timestamp before sending
-        if self.protocol.transmission_start is None:
-            timestamp_ms = 0
-        else:
-            timestamp_ms = int((time.time() - self.protocol.transmission_start) * 1000)
+        timestamp_ms = self.protocol.elapsed_ms()
         
         # Send packet
         self.protocol.send_packet(key_down, duration_ms, self.dest_addr)
@@ -25,7 +25,6 @@ import websockets
 import time
 import argparse
 import configparser
-import threading
 
 # Try to import audio library
 try:
@@ -35,6 +34,43 @@ try:
 except ImportError:
     AUDIO_AVAILABLE = False
 
+# Sidetone oscillator: one sine period in a power-of-two wavetable,
+# indexed by the top bits of a 32-bit phase accumulator
+SINE_TABLE_BITS = 12
+SINE_TABLE_SIZE = 1 << SINE_TABLE_BITS  # 4096 entries (16 KB float32)
+PHASE_BITS = 32
+PHASE_MASK = (1 << PHASE_BITS) - 1
+
+# The vectorized renderer works in blocks of at most this many frames: its
+# closed-form filter scales by (1 - alpha)^-n, which overflows float64 for
+# blocks of a few thousand frames
+RENDER_BLOCK_FRAMES = 256
+
+# Optional JIT for the per-sample sidetone kernel (NumPy renderer otherwise)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _render_chunk_jit(out, phase, envelope, filter_state, rate,
+                          phase_increment, volume, sine_table, filter_alpha):
+        """Per-sample envelope/oscillator/filter loop; returns updated state"""
+        shift = PHASE_BITS - SINE_TABLE_BITS
+        for i in range(out.shape[0]):
+            envelope = min(max(envelope + rate, 0.0), 1.0)
+            if envelope > 0.0001:
+                raw = sine_table[phase >> shift] * envelope * volume
+                filter_state += filter_alpha * (raw - filter_state)
+                out[i] = filter_state
+                phase = (phase + phase_increment) & PHASE_MASK
+            else:
+                out[i] = 0.0
+                filter_state = 0.0  # Reset filter when silent
+        return phase, envelope, filter_state
+
 
 class SidetoneGenerator:
     """Generate audio sidetone with improved signal quality"""
@@ -61,19 +97,21 @@ class SidetoneGenerator:
                         break
             
             self.stream = self.audio.open(
-                format=pyaudio.paFloat32,
+                format=pyaudio.paInt16,  # 16-bit is ample for a sidetone, half of float32's bytes
                 channels=1,
                 rate=sample_rate,
                 output=True,
                 output_device_index=device_index,
-                frames_per_buffer=128  # Low latency (~2.6ms at 48kHz)
+                frames_per_buffer=128,  # Low latency (~2.6ms at 48kHz)
+                stream_callback=self._audio_callback,
+                start=False  # Started once the renderer state below exists
             )
             
         except Exception as e:
             print(f"[AUDIO ERROR] Failed to open audio stream: {e}")
             raise
         
-        self.phase = 0.0
+        self.phase = 0  # 32-bit fixed-point phase (full cycle = 2^32)
         self.key_down = False
         self.envelope = 0.0
         self.target_envelope = 0.0
@@ -86,59 +124,99 @@ class SidetoneGenerator:
         self.filter_state = 0.0
         self.filter_alpha = 0.1  # Low-pass filter coefficient
         
-        # Start audio generation thread
-        self.running = True
-        self.audio_thread = threading.Thread(target=self._audio_loop)
-        self.audio_thread.daemon = True
-        self.audio_thread.start()
+        self._sine_table = np.sin(
+            2.0 * np.pi * np.arange(SINE_TABLE_SIZE) / SINE_TABLE_SIZE).astype(np.float32)
+        
+        # Per-chunk constants (frequency and envelope times are fixed)
+        self.phase_increment = int(round(self.frequency / self.sample_rate * (1 << PHASE_BITS)))
+        self.rise_rate = 1.0 / (self.rise_time * self.sample_rate)
+        self.fall_rate = 1.0 / (self.fall_time * self.sample_rate)
+        self._set_chunk_size(128)  # Match frames_per_buffer for consistency
+        
+        if NUMBA_AVAILABLE:
+            # Compile (or load from cache) now rather than on the first chunk
+            _render_chunk_jit(self._out, 0, 0.0, 0.0, 0.0, 0, 0.0, self._sine_table, self.filter_alpha)
+        
+        # PortAudio now pulls chunks from its own (realtime) audio thread
+        self.stream.start_stream()
+    
+    def _set_chunk_size(self, chunk_size):
+        """Precompute the per-block vectors for the vectorized renderer"""
+        self.chunk_size = chunk_size
+        block_size = min(chunk_size, RENDER_BLOCK_FRAMES)
+        # One-pole filter in closed form: y[n] = d^(n+1)*y0 + alpha*d^n * sum_k d^-k * x[k]
+        self._ramp = np.arange(1, block_size + 1, dtype=np.float64)
+        steps = np.arange(block_size, dtype=np.float64)
+        decay = 1.0 - self.filter_alpha
+        self._filter_decay = decay ** self._ramp
+        self._filter_gain = self.filter_alpha * decay ** steps
+        self._filter_growth = decay ** -steps
+        # Reused buffers: float32 render target and the int16 PCM handed to
+        # PyAudio without a tobytes() copy
+        self._out = np.zeros(chunk_size, dtype=np.float32)
+        self._pcm = np.zeros(chunk_size, dtype=np.int16)
+    
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio stream callback - renders frame_count samples per call
+        
+        Runs on PortAudio's audio thread, so the sender's own work can't delay
+        it. Samples are rendered in float32 and scaled to int16 in one pass
+        into a reused ndarray, returned as-is: PyAudio copies its buffer into
+        the device buffer before the next callback.
+        """
+        if frame_count != self.chunk_size:
+            self._set_chunk_size(frame_count)
+        # Rendered samples stay within [-1, 1], so scaling cannot overflow
+        np.multiply(self._render_chunk(), 32767.0, out=self._pcm, casting='unsafe')
+        return (self._pcm, pyaudio.paContinue)
     
-    def _audio_loop(self):
-        """Audio generation thread with optimized signal generation"""
-        chunk_size = 128  # Match frames_per_buffer for consistency
+    def _render_chunk(self):
+        """Render one chunk of sidetone samples into the reused output array"""
+        out = self._out
+        phase_increment = self.phase_increment
         
-        # Pre-calculate constants
-        phase_increment = self.frequency / self.sample_rate
-        rise_rate = 1.0 / (self.rise_time * self.sample_rate)
-        fall_rate = 1.0 / (self.fall_time * self.sample_rate)
-        two_pi = 2.0 * np.pi
+        # Key state is sampled once per chunk
+        key_down = self.key_down
+        self.target_envelope = 1.0 if key_down else 0.0
         
-        while self.running:
-            # Generate audio chunk
-            samples = np.zeros(chunk_size, dtype=np.float32)
-            
-            for i in range(chunk_size):
-                # Update target envelope based on key state
-                self.target_envelope = 1.0 if self.key_down else 0.0
-                
-                # Smooth envelope transition (exponential attack/release)
-                if self.key_down:
-                    # Attack (key down)
-                    self.envelope = min(self.envelope + rise_rate, self.target_envelope)
-                else:
-                    # Release (key up)
-                    self.envelope = max(self.envelope - fall_rate, self.target_envelope)
-                
-                # Generate sine wave only when envelope > 0 (CPU optimization)
-                if self.envelope > 0.0001:
-                    raw_sample = np.sin(two_pi * self.phase) * self.envelope * self.volume
-                    
-                    # Simple low-pass filter to smooth audio (reduces high-freq artifacts)
-                    self.filter_state += self.filter_alpha * (raw_sample - self.filter_state)
-                    samples[i] = self.filter_state
-                    
-                    # Advance phase
-                    self.phase += phase_increment
-                    if self.phase >= 1.0:
-                        self.phase -= 1.0
-                else:
-                    samples[i] = 0.0
-                    self.filter_state = 0.0  # Reset filter when silent
-            
-            # Output audio
-            try:
-                self.stream.write(samples.tobytes())
-            except:
-                pass
+        # Envelope ramp (attack when key down, release when key up)
+        rate = self.rise_rate if key_down else -self.fall_rate
+        
+        if NUMBA_AVAILABLE:
+            self.phase, self.envelope, self.filter_state = _render_chunk_jit(
+                out, self.phase, self.envelope, self.filter_state, rate,
+                phase_increment, self.volume, self._sine_table, self.filter_alpha)
+            return out
+        
+        # Longer chunks are rendered block by block, carrying the state over
+        block_size = len(self._ramp)
+        for start in range(0, self.chunk_size, block_size):
+            self._render_block(out[start:start + block_size], rate, phase_increment)
+        return out
+    
+    def _render_block(self, out, rate, phase_increment):
+        """Vectorized render of one block (at most RENDER_BLOCK_FRAMES samples)"""
+        n = len(out)
+        envelope = np.clip(self.envelope + self._ramp[:n] * rate, 0.0, 1.0)
+        self.envelope = float(envelope[-1])
+        
+        # Generate sine wave only where envelope > 0 (silent samples hold
+        # phase); the envelope is monotonic, so audible samples are contiguous
+        audible = envelope > 0.0001
+        audible_before = np.cumsum(audible) - audible
+        phases = (self.phase + audible_before * phase_increment) & PHASE_MASK
+        self.phase = (self.phase + int(np.count_nonzero(audible)) * phase_increment) & PHASE_MASK
+        raw = self._sine_table[phases >> (PHASE_BITS - SINE_TABLE_BITS)] * envelope * self.volume
+        raw[~audible] = 0.0
+        
+        # Simple low-pass filter to smooth audio (reduces high-freq artifacts)
+        state = self.filter_state if audible[0] else 0.0
+        filtered = (self._filter_decay[:n] * state +
+                    self._filter_gain[:n] * np.cumsum(raw * self._filter_growth[:n]))
+        filtered[~audible] = 0.0  # Reset filter when silent
+        self.filter_state = float(filtered[-1])
+        np.copyto(out, filtered, casting='same_kind')
     
     def set_key(self, key_down):
         """Set key state"""
@@ -149,11 +227,8 @@ class SidetoneGenerator:
         if not AUDIO_AVAILABLE:
             return
         
-        self.running = False
-        if hasattr(self, 'audio_thread'):
-            self.audio_thread.join(timeout=1.0)
         if hasattr(self, 'stream'):
-            self.stream.stop_stream()
+            self.stream.stop_stream()  # Waits for any in-flight callback
             self.stream.close()
         if hasattr(self, 'audio'):
             self.audio.terminate()